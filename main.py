@@ -1,5 +1,8 @@
 """Entry point da aplicação TradutorOn."""
+import heapq
 import sys
+import threading
+import time
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QTextEdit, QGroupBox, QProgressBar
@@ -8,15 +11,46 @@ from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal
 from PyQt6.QtGui import QFont
 from loguru import logger
 from datetime import datetime
+from typing import Tuple
 from src.config.logger import LoggerSetup
 from src.gui.area_selector import AreaSelector
-from src.gui.translation_overlay import TranslationReplacer
-from src.gui.settings_dialog import SettingsDialog
-from src.gui.translation_history import TranslationHistoryDialog
+from src.gui.translation_overlay import TranslationReplacer, TextFitter
+from src.utils.history_log import HistoryLog
 from src.utils.language_detector import LanguageDetector
 from src.utils.text_grouper import TextGrouper
 
 
+# Estilo da janela principal, parseado uma vez (seletores por objectName;
+# a propriedade "state" troca as cores enquanto a tradução roda)
+MAIN_QSS = """
+#titleLabel { padding: 15px; color: #2196F3; }
+#subtitleLabel { font-size: 12px; color: #666; padding-bottom: 10px; }
+#statusLabel { font-size: 16px; color: green; padding: 10px; }
+#statusLabel[state="running"] { color: orange; }
+#runtimeLabel { font-size: 11px; color: #555; padding: 5px; }
+#translationsLabel, #overlaysLabel, #cacheLabel, #dbSizeLabel {
+    font-size: 11px; padding: 5px;
+}
+#infoLabel { padding: 10px; font-size: 11px; }
+#startButton {
+    background-color: #4CAF50; color: white;
+    font-size: 14px; font-weight: bold;
+}
+#startButton[state="running"] { background-color: #f44336; }
+#logView {
+    background: #1e1e1e; color: #00ff00;
+    font-family: 'Courier New'; font-size: 11px; padding: 8px;
+}
+"""
+
+
+def _set_state(widget: QWidget, state: str):
+    """Marca o estado do widget ("running" ou "") e repolia o estilo."""
+    widget.setProperty("state", state)
+    widget.style().unpolish(widget)
+    widget.style().polish(widget)
+
+
 class PipelineWorker(QThread):
     """Worker thread para rodar pipeline sem travar GUI."""
     
@@ -40,8 +74,14 @@ class PipelineWorker(QThread):
         )
         
         # Cache de resultados recentes para evitar duplicatas
+        # (time.monotonic(), só para calcular idade)
         self.recent_results = {}
         self.last_emission_time = {}
+        # (timestamp, chave) por ordem de idade, para expirar sem varrer tudo
+        self._expiry_heap = []
+        # Resultados chegam pelas threads de OCR do pipeline (várias): o
+        # cache de duplicatas só é lido/alterado com esta trava
+        self._dedupe_lock = threading.Lock()
         
     def run(self):
         """Executa pipeline em thread separada."""
@@ -84,9 +124,6 @@ class PipelineWorker(QThread):
                         stats = self.pipeline.get_stats()
                         self.stats_updated.emit(stats)
                         
-                        # Limpar cache antigo
-                        self._cleanup_old_cache()
-                        
                 # Se chegou aqui, saiu normalmente
                 break
                     
@@ -140,16 +177,23 @@ class PipelineWorker(QThread):
             # Criar chave única para este resultado
             result_key = self._make_result_key(original, translated)
             
-            # Verificar se já processamos este resultado recentemente
-            if self._is_recent_duplicate(result_key):
+            with self._dedupe_lock:
+                # Limpar cache antigo
+                self._cleanup_old_cache()
+                
+                # Verificar se já processamos este resultado recentemente
+                duplicate = self._is_recent_duplicate(result_key)
+                if not duplicate:
+                    # Registrar resultado
+                    now = time.monotonic()
+                    self.recent_results[result_key] = now
+                    self.last_emission_time[result_key] = now
+                    heapq.heappush(self._expiry_heap, (now, result_key))
+                    self.result_count += 1
+                    
+            if duplicate:
                 logger.debug(f"⚠️ Resultado duplicado ignorado: '{translated[:30]}'")
                 return
-                
-            # Registrar resultado
-            self.recent_results[result_key] = datetime.now()
-            self.last_emission_time[result_key] = datetime.now()
-                
-            self.result_count += 1
             
             # Log detalhado para debug
             logger.debug(f"🔍 Resultado #{self.result_count}: {result.keys()}")
@@ -182,8 +226,11 @@ class PipelineWorker(QThread):
                 'confidence': result.get('confidence', 1.0),
                 'language': language,
                 'provider': result.get('provider', 'unknown'),
-                'timestamp': datetime.now().strftime('%H:%M:%S')
+                'timestamp': time.strftime('%H:%M:%S')
             }
+
+            # Ajuste do texto do balão feito aqui, fora da thread da GUI
+            normalized['fitted'] = TextFitter.preshape(translated, bbox)
             
             logger.debug(f"✅ Emitindo: orig='{original[:30]}', trans='{translated[:30]}', lang={language}")
             
@@ -192,51 +239,49 @@ class PipelineWorker(QThread):
         except Exception as e:
             logger.error(f"Erro ao processar resultado individual: {e}")
             
-    def _make_result_key(self, original: str, translated: str) -> str:
-        """Cria chave única para resultado."""
+    def _make_result_key(self, original: str, translated: str) -> Tuple[str, str]:
+        """Cria chave única para resultado (tupla, sem formatar string)."""
         # Normalizar texto (lowercase, sem espaços extras)
-        orig_normalized = original.lower().strip()
-        trans_normalized = translated.lower().strip()
-        return f"{orig_normalized}||{trans_normalized}"
+        return original.lower().strip(), translated.lower().strip()
         
-    def _is_recent_duplicate(self, result_key: str) -> bool:
+    def _is_recent_duplicate(self, result_key: Tuple[str, str]) -> bool:
         """Verifica se resultado é duplicata recente."""
         if result_key not in self.recent_results:
             return False
             
         # Verificar idade
-        age = datetime.now() - self.recent_results[result_key]
+        now = time.monotonic()
+        age = now - self.recent_results[result_key]
         
         # Considerar duplicata se foi processado nos últimos 3 segundos
-        if age.total_seconds() < 3.0:
+        if age < 3.0:
             return True
             
         # Verificar cooldown de emissão (mínimo 2 segundos entre emissões)
         if result_key in self.last_emission_time:
-            last_emission_age = datetime.now() - self.last_emission_time[result_key]
-            if last_emission_age.total_seconds() < 2.0:
+            last_emission_age = now - self.last_emission_time[result_key]
+            if last_emission_age < 2.0:
                 return True
                 
         return False
         
     def _cleanup_old_cache(self):
-        """Remove entradas antigas do cache."""
-        now = datetime.now()
-        
-        # Limpar recent_results
-        expired_keys = []
-        for key, timestamp in self.recent_results.items():
-            age = now - timestamp
-            if age.total_seconds() > 10.0:  # Manter por 10 segundos
-                expired_keys.append(key)
+        """Remove entradas antigas do cache (só as vencidas, pelo heap; com _dedupe_lock)."""
+        now = time.monotonic()
+        heap = self._expiry_heap
+        expired = 0
+        
+        # Limpar recent_results: entrada cuja chave foi registrada de novo
+        # depois é obsoleta e só sai do heap
+        while heap and now - heap[0][0] > 10.0:  # Manter por 10 segundos
+            timestamp, key = heapq.heappop(heap)
+            if self.recent_results.get(key) == timestamp:
+                del self.recent_results[key]
+                self.last_emission_time.pop(key, None)
+                expired += 1
                 
-        for key in expired_keys:
-            del self.recent_results[key]
-            if key in self.last_emission_time:
-                del self.last_emission_time[key]
-                
-        if expired_keys:
-            logger.debug(f"🗑️ Cache worker limpo: {len(expired_keys)} entradas")
+        if expired:
+            logger.debug(f"🗑️ Cache worker limpo: {expired} entradas")
             
     def stop(self):
         """Para pipeline."""
@@ -260,7 +305,8 @@ class SimpleMainWindow(QMainWindow):
         self.translation_overlay = None
         self.translation_count = 0
         self.is_running = False
-        self.translation_history = []  # Histórico de traduções
+        self.translation_history = HistoryLog()  # Histórico de traduções (espelhado em CSV)
+        self._settings_dialog = None  # Criado na primeira abertura
         self.init_ui()
         logger.info("GUI inicializada")
         
@@ -292,12 +338,12 @@ class SimpleMainWindow(QMainWindow):
         title_font.setBold(True)
         title.setFont(title_font)
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        title.setStyleSheet("padding: 15px; color: #2196F3;")
+        title.setObjectName("titleLabel")
         layout.addWidget(title)
         
         subtitle = QLabel("Tradutor de Mangá em Tempo Real v2.0")
         subtitle.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        subtitle.setStyleSheet("font-size: 12px; color: #666; padding-bottom: 10px;")
+        subtitle.setObjectName("subtitleLabel")
         layout.addWidget(subtitle)
         
         # Status
@@ -305,27 +351,27 @@ class SimpleMainWindow(QMainWindow):
         status_layout = QVBoxLayout()
         
         self.status_label = QLabel("✅ Sistema pronto!")
-        self.status_label.setStyleSheet("font-size: 16px; color: green; padding: 10px;")
+        self.status_label.setObjectName("statusLabel")
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         self.runtime_label = QLabel("⏱️ Tempo de execução: 00:00:00")
         self.runtime_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.runtime_label.setStyleSheet("font-size: 11px; color: #555; padding: 5px;")
+        self.runtime_label.setObjectName("runtimeLabel")
         
         # Estatísticas em tempo real
         stats_hlayout = QHBoxLayout()
         
         self.translations_label = QLabel("📝 Traduções: 0")
-        self.translations_label.setStyleSheet("font-size: 11px; padding: 5px;")
+        self.translations_label.setObjectName("translationsLabel")
         
         self.overlays_label = QLabel("👁️ Overlays: 0")
-        self.overlays_label.setStyleSheet("font-size: 11px; padding: 5px;")
+        self.overlays_label.setObjectName("overlaysLabel")
         
         self.cache_label = QLabel("💾 Cache: 0")
-        self.cache_label.setStyleSheet("font-size: 11px; padding: 5px;")
+        self.cache_label.setObjectName("cacheLabel")
         
         self.db_size_label = QLabel("💽 DB: 0.00 MB")
-        self.db_size_label.setStyleSheet("font-size: 11px; padding: 5px;")
+        self.db_size_label.setObjectName("dbSizeLabel")
         
         stats_hlayout.addWidget(self.translations_label)
         stats_hlayout.addWidget(self.overlays_label)
@@ -339,7 +385,7 @@ class SimpleMainWindow(QMainWindow):
             "🖼️ Captura: MSS + Overlay\n"
             "🔍 Detecção: Auto idioma + Agrupamento"
         )
-        info_label.setStyleSheet("padding: 10px; font-size: 11px;")
+        info_label.setObjectName("infoLabel")
         
         status_layout.addWidget(self.status_label)
         status_layout.addWidget(self.runtime_label)
@@ -405,10 +451,7 @@ class SimpleMainWindow(QMainWindow):
         # Botão START/STOP dinâmico
         self.start_stop_btn = QPushButton("🚀 Iniciar Tradução")
         self.start_stop_btn.setMinimumHeight(50)
-        self.start_stop_btn.setStyleSheet(
-            "background-color: #4CAF50; color: white; "
-            "font-size: 14px; font-weight: bold;"
-        )
+        self.start_stop_btn.setObjectName("startButton")
         self.start_stop_btn.clicked.connect(self.toggle_translation)
         
         test_layout.addLayout(row1)
@@ -425,10 +468,7 @@ class SimpleMainWindow(QMainWindow):
         self.log_text = QTextEdit()
         self.log_text.setReadOnly(True)
         self.log_text.setMinimumHeight(200)
-        self.log_text.setStyleSheet(
-            "background: #1e1e1e; color: #00ff00; "
-            "font-family: 'Courier New'; font-size: 11px; padding: 8px;"
-        )
+        self.log_text.setObjectName("logView")
         
         log_layout.addWidget(self.log_text)
         log_group.setLayout(log_layout)
@@ -477,8 +517,8 @@ class SimpleMainWindow(QMainWindow):
     def load_saved_area(self):
         """Carrega área salva das configurações."""
         try:
-            from src.config.settings import SettingsManager
-            settings = SettingsManager()
+            from src.config.settings import get_settings
+            settings = get_settings()
             
             saved_area = settings.get('capture.region')
             if saved_area:
@@ -498,8 +538,8 @@ class SimpleMainWindow(QMainWindow):
     def clear_saved_area(self):
         """Limpa área salva das configurações."""
         try:
-            from src.config.settings import SettingsManager
-            settings = SettingsManager()
+            from src.config.settings import get_settings
+            settings = get_settings()
             settings.set('capture.region', None)
             settings.save()
             self.selected_area = None
@@ -520,8 +560,8 @@ class SimpleMainWindow(QMainWindow):
         self.statusBar().showMessage("⏳ Testando configurações...")
         
         try:
-            from src.config.settings import SettingsManager
-            settings = SettingsManager()
+            from src.config.settings import get_settings
+            settings = get_settings()
             
             groq_key = settings.get_api_key('groq')
             if groq_key:
@@ -560,10 +600,10 @@ class SimpleMainWindow(QMainWindow):
         self.statusBar().showMessage("Testando tradutores...")
 
         try:
-            from src.config.settings import SettingsManager
+            from src.config.settings import get_settings
             from src.translation.translator import TranslationService
 
-            settings = SettingsManager()
+            settings = get_settings()
             groq_key = settings.get_api_key("groq")
 
             # Ler configurações do Ollama a partir do YAML
@@ -655,14 +695,23 @@ class SimpleMainWindow(QMainWindow):
         
         self.statusBar().showMessage("✅ Overlay de teste ativo")
         
+    def get_settings_dialog(self):
+        """Retorna o diálogo de configurações, criando-o no primeiro uso."""
+        if self._settings_dialog is None:
+            from src.config.settings import get_settings
+            from src.gui.settings_dialog import SettingsDialog
+            
+            self._settings_dialog = SettingsDialog(get_settings(), self)
+        else:
+            self._settings_dialog.refresh()
+        return self._settings_dialog
+        
     def open_settings(self):
         """Abre diálogo de configurações."""
         try:
-            from src.config.settings import SettingsManager
-            settings = SettingsManager()
-            
-            dialog = SettingsDialog(settings, self)
-            if dialog.exec():
+            dialog = self.get_settings_dialog()
+            # Só avisa quando algo mudou de fato
+            if dialog.exec() and dialog.changed_keys:
                 self.log("")
                 self.log("✅ Configurações atualizadas!")
                 self.log("💡 Reinicie a tradução para aplicar mudanças")
@@ -675,6 +724,8 @@ class SimpleMainWindow(QMainWindow):
     def open_history(self):
         """Abre histórico de traduções."""
         try:
+            from src.gui.translation_history import TranslationHistoryDialog
+            
             dialog = TranslationHistoryDialog(self.translation_history, self)
             dialog.exec()
             
@@ -720,12 +771,9 @@ class SimpleMainWindow(QMainWindow):
         # Atualizar UI
         self.is_running = True
         self.start_stop_btn.setText("⏹️ Parar Tradução")
-        self.start_stop_btn.setStyleSheet(
-            "background-color: #f44336; color: white; "
-            "font-size: 14px; font-weight: bold;"
-        )
+        _set_state(self.start_stop_btn, "running")
         self.status_label.setText("🔄 Traduzindo em tempo real...")
-        self.status_label.setStyleSheet("font-size: 16px; color: orange; padding: 10px;")
+        _set_state(self.status_label, "running")
         self.progress_bar.setVisible(True)
         self.statusBar().showMessage("🔄 Pipeline + Overlay rodando...")
         
@@ -734,8 +782,8 @@ class SimpleMainWindow(QMainWindow):
         
         # Iniciar worker
         try:
-            from src.config.settings import SettingsManager
-            settings = SettingsManager()
+            from src.config.settings import get_settings
+            settings = get_settings()
             
             self.pipeline_worker = PipelineWorker(self.selected_area, settings)
             self.pipeline_worker.translation_received.connect(self.on_translation_result)
@@ -764,12 +812,9 @@ class SimpleMainWindow(QMainWindow):
         # Atualizar UI
         self.is_running = False
         self.start_stop_btn.setText("🚀 Iniciar Tradução")
-        self.start_stop_btn.setStyleSheet(
-            "background-color: #4CAF50; color: white; "
-            "font-size: 14px; font-weight: bold;"
-        )
+        _set_state(self.start_stop_btn, "")
         self.status_label.setText("✅ Sistema pronto!")
-        self.status_label.setStyleSheet("font-size: 16px; color: green; padding: 10px;")
+        _set_state(self.status_label, "")
         self.progress_bar.setVisible(False)
         self.statusBar().showMessage("✅ Pipeline parado")
         
@@ -801,8 +846,8 @@ class SimpleMainWindow(QMainWindow):
         
         # Salvar nas configurações
         try:
-            from src.config.settings import SettingsManager
-            settings = SettingsManager()
+            from src.config.settings import get_settings
+            settings = get_settings()
             settings.set('capture.region', list(area))
             settings.save()
             save_msg = "💾 Área salva automaticamente!"
@@ -848,7 +893,8 @@ class SimpleMainWindow(QMainWindow):
                 'translated': translated,
                 'language': language,
                 'provider': provider,
-                'confidence': confidence
+                'confidence': confidence,
+                'language_upper': language.upper()
             }
             self.translation_history.append(history_item)
             
@@ -857,7 +903,7 @@ class SimpleMainWindow(QMainWindow):
                 self.translation_history.pop(0)
             
             # Log detalhado
-            self.log(f"📝 #{self.translation_count} [{language.upper()}] {original[:50]}...")
+            self.log(f"📝 #{self.translation_count} [{history_item['language_upper']}] {original[:50]}...")
             self.log(f"   → {translated[:80]}")
             self.log(f"   Confiança: {confidence:.1f}% | Provedor: {provider}")
             
@@ -912,6 +958,7 @@ def main():
     app = QApplication(sys.argv)
     app.setApplicationName("TradutorOn")
     app.setStyle("Fusion")
+    app.setStyleSheet(MAIN_QSS)
     
     window = SimpleMainWindow()
     window.show()
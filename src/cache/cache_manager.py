@@ -3,7 +3,7 @@ Gerenciador de cache com SQLite.
 """
 
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy import create_engine, func
 from sqlalchemy.orm import sessionmaker, Session
@@ -78,6 +78,54 @@ class CacheManager:
         finally:
             session.close()
 
+    def get_translations_bulk(
+        self,
+        items: List[Tuple[str, str]],
+        target_lang: str
+    ) -> Dict[Tuple[str, str], str]:
+        """
+        Busca várias traduções no cache com uma única consulta.
+        
+        Args:
+            items: Pares (texto original, idioma origem)
+            target_lang: Idioma destino
+            
+        Returns:
+            Dict (texto original, idioma origem) -> texto traduzido, só
+            com os encontrados
+        """
+        if not items:
+            return {}
+
+        wanted = set(items)
+        session: Session = self.SessionLocal()
+        try:
+            entries = session.query(TranslationCache).filter(
+                TranslationCache.target_lang == target_lang,
+                TranslationCache.original_text.in_({text for text, _ in wanted})
+            ).all()
+
+            found: Dict[Tuple[str, str], str] = {}
+            now = datetime.now()
+            for entry in entries:
+                key = (entry.original_text, entry.source_lang)
+                if key in wanted and key not in found:
+                    # Atualizar estatísticas
+                    entry.accessed_count += 1
+                    entry.last_accessed = now
+                    found[key] = entry.translated_text
+
+            if found:
+                session.commit()
+                logger.debug(f"Cache hit: {len(found)}/{len(wanted)} textos")
+            return found
+
+        except Exception as e:
+            logger.error(f"Erro ao buscar no cache: {e}")
+            return {}
+        finally:
+            session.close()
+
     def save_translation(
         self,
         original_text: str,
@@ -138,6 +186,56 @@ class CacheManager:
         finally:
             session.close()
 
+    def save_translations_bulk(self, entries: List[Dict[str, Any]]):
+        """
+        Salva várias traduções no cache em uma única transação.
+        
+        Args:
+            entries: Dicts com os argumentos de save_translation
+                (original_text, translated_text, source_lang, target_lang,
+                provider e, opcionalmente, confidence)
+        """
+        if not entries:
+            return
+
+        session: Session = self.SessionLocal()
+        try:
+            now = datetime.now()
+            for data in entries:
+                existing = session.query(TranslationCache).filter_by(
+                    original_text=data['original_text'],
+                    source_lang=data['source_lang'],
+                    target_lang=data['target_lang']
+                ).first()
+
+                if existing:
+                    existing.translated_text = data['translated_text']
+                    existing.provider = data['provider']
+                    existing.confidence = data.get('confidence', 1.0)
+                    existing.accessed_count += 1
+                    existing.last_accessed = now
+                else:
+                    session.add(TranslationCache(
+                        original_text=data['original_text'],
+                        translated_text=data['translated_text'],
+                        source_lang=data['source_lang'],
+                        target_lang=data['target_lang'],
+                        provider=data['provider'],
+                        confidence=data.get('confidence', 1.0)
+                    ))
+
+            session.commit()
+            logger.debug(f"{len(entries)} tradução(ões) salva(s) no cache")
+
+            # Limite de entradas verificado uma vez para o lote
+            self._cleanup_if_needed(session)
+
+        except Exception as e:
+            logger.error(f"Erro ao salvar no cache: {e}")
+            session.rollback()
+        finally:
+            session.close()
+
     def _cleanup_if_needed(self, session: Session):
         """Remove entradas antigas se exceder o limite."""
         count = session.query(TranslationCache).count()
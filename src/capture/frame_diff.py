@@ -45,7 +45,7 @@ class FrameDiff:
             previous_frame = self.last_frame
 
         if previous_frame is None:
-            self.last_frame = current_frame.copy()
+            self._store_frame(current_frame)
             return True, 1.0
 
         try:
@@ -59,7 +59,7 @@ class FrameDiff:
             changed = diff_value > self.threshold
             
             if changed:
-                self.last_frame = current_frame.copy()
+                self._store_frame(current_frame)
                 logger.debug(f"Mudança detectada: {diff_value:.4f}")
 
             return changed, diff_value
@@ -68,12 +68,23 @@ class FrameDiff:
             logger.error(f"Erro ao detectar mudança: {e}")
             return True, 1.0
 
+    def _store_frame(self, frame: np.ndarray):
+        """Guarda o frame de referência, reaproveitando o buffer se couber."""
+        last = self.last_frame
+        if last is not None and last.shape == frame.shape and last.dtype == frame.dtype:
+            np.copyto(last, frame)
+        else:
+            self.last_frame = frame.copy()
+
     def _calculate_mse(self, frame1: np.ndarray, frame2: np.ndarray) -> float:
         """Calcula Mean Squared Error normalizado."""
         if frame1.shape != frame2.shape:
             return 1.0
 
-        mse = np.mean((frame1.astype(float) - frame2.astype(float)) ** 2)
+        # Soma das diferenças ao quadrado direto nos uint8 (laço vetorizado
+        # SIMD do OpenCV), sem as cópias em float do frame inteiro
+        sse = cv2.norm(frame1, frame2, cv2.NORM_L2SQR)
+        mse = sse / frame1.size
         # Normalizar para 0-1
         normalized = mse / (255.0 ** 2)
         return normalized
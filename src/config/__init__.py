@@ -1,4 +1,4 @@
-from .settings import SettingsManager
+from .settings import SettingsManager, get_settings
 from .logger import LoggerSetup
 
-__all__ = ["SettingsManager", "LoggerSetup"]
+__all__ = ["SettingsManager", "get_settings", "LoggerSetup"]
@@ -3,6 +3,7 @@ Gerenciador de configurações.
 """
 
 import os
+from functools import cache
 from pathlib import Path
 from typing import Any, Optional
 import yaml
@@ -30,6 +31,7 @@ class SettingsManager:
 
         # Carregar configuração YAML
         self.config_path = Path(config_path)
+        self._mtime = self._stat_mtime()
         self.config = self._load_config()
         
         logger.info(f"Configurações carregadas de {config_path}")
@@ -48,6 +50,70 @@ class SettingsManager:
             logger.error(f"Erro ao carregar configuração: {e}")
             return {}
 
+    def _stat_mtime(self) -> Optional[float]:
+        """Retorna o mtime do arquivo de configuração (None se não existir)."""
+        try:
+            return self.config_path.stat().st_mtime
+        except OSError:
+            return None
+
+    def reload_if_changed(self) -> bool:
+        """
+        Recarrega o YAML se ele foi alterado fora do app desde a última leitura.
+        
+        Returns:
+            True se a configuração foi recarregada
+        """
+        mtime = self._stat_mtime()
+        if mtime == self._mtime:
+            return False
+
+        self._mtime = mtime
+        self.config = self._load_config()
+        logger.info(f"Configurações recarregadas de {self.config_path}")
+        return True
+
+    def get_many(self, prefix: str) -> dict:
+        """
+        Retorna uma seção achatada em notação de ponto, com chaves completas.
+        
+        Valores None são omitidos, como em get().
+        
+        Args:
+            prefix: Seção no formato 'section' ou 'section.subsection'
+            
+        Example:
+            >>> settings.get_many('ocr')['ocr.languages']
+            ['en', 'ko']
+        """
+        node = self.get(prefix) if prefix else self.config
+        if not isinstance(node, dict):
+            return {}
+
+        flat = {}
+        stack = [(f"{prefix}." if prefix else "", node)]
+
+        while stack:
+            base, node = stack.pop()
+            for k, v in node.items():
+                key = f"{base}{k}"
+                if isinstance(v, dict):
+                    stack.append((f"{key}.", v))
+                elif v is not None:
+                    flat[key] = v
+
+        return flat
+
+    def snapshot(self) -> dict:
+        """
+        Retorna todas as configurações achatadas em notação de ponto.
+        
+        Example:
+            >>> settings.snapshot()['ocr.languages']
+            ['en', 'ko']
+        """
+        return self.get_many("")
+
     def get(self, key: str, default: Any = None) -> Any:
         """
         Obtém valor de configuração usando notação de ponto.
@@ -84,6 +150,22 @@ class SettingsManager:
             key: Chave no formato 'section.subsection.key'
             value: Valor a definir
         """
+        self._assign(key, value)
+        logger.debug(f"Configuração atualizada: {key} = {value}")
+
+    def update(self, values: dict):
+        """
+        Define várias configurações de uma vez (um único log no final).
+        
+        Args:
+            values: Dict {'section.subsection.key': valor}
+        """
+        for key, value in values.items():
+            self._assign(key, value)
+        logger.debug(f"Configurações atualizadas: {', '.join(values)}")
+
+    def _assign(self, key: str, value: Any):
+        """Grava um valor na árvore usando notação de ponto."""
         keys = key.split('.')
         config = self.config
 
@@ -93,13 +175,13 @@ class SettingsManager:
             config = config[k]
 
         config[keys[-1]] = value
-        logger.debug(f"Configuração atualizada: {key} = {value}")
 
     def save(self):
         """Salva configurações no arquivo YAML."""
         try:
             with open(self.config_path, 'w', encoding='utf-8') as f:
                 yaml.safe_dump(self.config, f, default_flow_style=False)
+            self._mtime = self._stat_mtime()
             logger.info(f"Configurações salvas em {self.config_path}")
         except Exception as e:
             logger.error(f"Erro ao salvar configurações: {e}")
@@ -109,6 +191,11 @@ class SettingsManager:
         db_path = self.get('cache.db_path', './cache/translations.db')
         return Path(db_path)
 
+    def get_history_dir(self) -> Path:
+        """Retorna pasta do CSV de histórico da sessão (junto dos logs)."""
+        log_file = self.get('logging.file', './logs/translator.log')
+        return Path(log_file).parent / 'history'
+
     def get_api_key(self, provider: str) -> Optional[str]:
         """
         Obtém API key do ambiente.
@@ -133,3 +220,9 @@ class SettingsManager:
             logger.debug(f"API key '{env_var}' não configurada ou inválida")
         
         return None
+
+
+@cache
+def get_settings() -> SettingsManager:
+    """Retorna a instância compartilhada do SettingsManager (criada no primeiro uso)."""
+    return SettingsManager()
@@ -0,0 +1,17 @@
+"""Fontes compartilhadas pelos diálogos."""
+from functools import lru_cache
+
+
+@lru_cache(maxsize=8)
+def title_font(size: int, bold: bool = True):
+    """
+    Fonte de título dos diálogos, criada uma vez por (size, bold).
+
+    Só pode ser chamada na thread da GUI, com a QApplication já criada.
+    """
+    from PyQt6.QtGui import QFont
+
+    font = QFont()
+    font.setPointSize(size)
+    font.setBold(bold)
+    return font
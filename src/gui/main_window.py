@@ -1,10 +1,11 @@
 """Entry point da aplicação TradutorOn (GUI principal)."""
 
 import sys
-from datetime import datetime
+import time
+from collections import deque
+from typing import Optional
 
 from PyQt6.QtWidgets import (
-    QApplication,
     QMainWindow,
     QWidget,
     QVBoxLayout,
@@ -15,15 +16,79 @@ from PyQt6.QtWidgets import (
     QGroupBox,
     QProgressBar,
 )
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, QEvent
 from PyQt6.QtGui import QFont
 from loguru import logger
 
-from src.config.logger import LoggerSetup
-from src.config.settings import SettingsManager
-from src.gui.area_selector import AreaSelector
-from src.gui.translation_overlay import TranslationReplacer
-from src.pipeline.worker import PipelineWorker
+from src.utils.history_log import HistoryLog
+
+# Módulos de configuração, overlay, pipeline e tradução são importados dentro
+# dos callbacks que os usam, fora do caminho de inicialização da janela.
+
+
+# Folha de estilo única da aplicação, aplicada uma vez na QApplication em
+# main(); os seletores casam por objectName. Estados dinâmicos usam a
+# propriedade "state".
+APP_QSS = """
+#titleLabel { padding: 15px; color: #2196F3; }
+#subtitleLabel { font-size: 12px; color: #666; padding-bottom: 10px; }
+#statusLabel { font-size: 16px; color: green; padding: 10px; }
+#statusLabel[state="running"] { color: orange; }
+#runtimeLabel { font-size: 11px; color: #555; padding: 5px; }
+#translationsLabel, #overlaysLabel, #cacheLabel, #dbSizeLabel {
+    font-size: 11px; padding: 5px;
+}
+#infoLabel { padding: 10px; font-size: 12px; }
+#testButton { font-size: 13px; }
+#clearLogButton { font-size: 12px; }
+#startButton {
+    background-color: #4CAF50; color: white;
+    font-size: 14px; font-weight: bold;
+}
+#startButton[state="running"] { background-color: #f44336; }
+#logView {
+    background: #1e1e1e; color: #00ff00;
+    font-family: 'Courier New'; font-size: 11px; padding: 8px;
+}
+"""
+
+
+# Linhas mantidas no log (buffer pendente e documento do QTextEdit)
+_LOG_MAX_LINES = 2000
+
+# Máximo de traduções logadas por segundo; o excedente vira uma linha resumo
+_LOG_BUDGET_PER_SECOND = 10
+
+# Strings pré-formatadas para os contadores (sessões típicas ficam aqui)
+_SMALL_INTS = [str(i) for i in range(1024)]
+
+
+def _int_str(n: int) -> str:
+    """Converte inteiro para texto reaproveitando a tabela de pequenos."""
+    return _SMALL_INTS[n] if 0 <= n < 1024 else str(n)
+
+
+def _fast_hms(t: Optional[float] = None) -> str:
+    """Formata HH:MM:SS sem strftime (t=None usa o horário atual)."""
+    lt = time.localtime(t)
+    return f"{lt.tm_hour:02}:{lt.tm_min:02}:{lt.tm_sec:02}"
+
+
+def _fast_dmy_hms(t: Optional[float] = None) -> str:
+    """Formata DD/MM/AAAA HH:MM:SS sem strftime."""
+    lt = time.localtime(t)
+    return (
+        f"{lt.tm_mday:02}/{lt.tm_mon:02}/{lt.tm_year} "
+        f"{lt.tm_hour:02}:{lt.tm_min:02}:{lt.tm_sec:02}"
+    )
+
+
+def _set_state(widget: QWidget, state: str):
+    """Troca a propriedade "state" e re-aplica o estilo do widget."""
+    widget.setProperty("state", state)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
 
 
 class SimpleMainWindow(QMainWindow):
@@ -32,12 +97,27 @@ class SimpleMainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
 
+        # Linhas de log pendentes (timestamp, mensagem), formatadas e
+        # descarregadas no QTextEdit a cada 100 ms
+        self._log_buffer = deque(maxlen=_LOG_MAX_LINES)
+        self.log_flush_timer = QTimer()
+        self.log_flush_timer.setSingleShot(True)
+        self.log_flush_timer.setTimerType(Qt.TimerType.CoarseTimer)
+        self.log_flush_timer.setInterval(100)
+        self.log_flush_timer.timeout.connect(self._flush_log)
+
         # Estado de captura/tradução
         self.selected_area = None
         self.pipeline_worker = None
         self.translation_overlay = None
         self.translation_count = 0
-        self.translation_history = []  # histórico em memória
+        self.overlay_count = 0
+
+        # Orçamento de log por segundo para rajadas do pipeline
+        self._events_window = 0
+        self._events_this_second = 0
+        self._suppressed_logs = 0
+        self.translation_history = HistoryLog()  # histórico em memória (espelhado em CSV)
         self.is_running = False
 
         self.init_ui()
@@ -47,10 +127,20 @@ class SimpleMainWindow(QMainWindow):
         self.load_saved_area()
 
         # Timer para atualizar tempo de execução
-        self.start_time = datetime.now()
+        self._start_mono = time.monotonic()
         self.update_timer = QTimer()
+        # Precisão de segundos basta; deixa o SO agrupar os wake-ups
+        self.update_timer.setTimerType(Qt.TimerType.VeryCoarseTimer)
+        self.update_timer.setInterval(1000)  # Atualiza a cada 1 segundo
         self.update_timer.timeout.connect(self.update_runtime)
-        self.update_timer.start(1000)  # Atualiza a cada 1 segundo
+        # Só roda com a janela visível (ver showEvent/hideEvent/changeEvent)
+
+        # Sincronização agrupada dos contadores (no máximo 4x por segundo)
+        self.counter_timer = QTimer()
+        self.counter_timer.setSingleShot(True)
+        self.counter_timer.setTimerType(Qt.TimerType.CoarseTimer)
+        self.counter_timer.setInterval(250)
+        self.counter_timer.timeout.connect(self._sync_counters)
 
     def init_ui(self):
         """Inicializa interface."""
@@ -72,14 +162,12 @@ class SimpleMainWindow(QMainWindow):
         title_font.setBold(True)
         title.setFont(title_font)
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        title.setStyleSheet("padding: 15px; color: #2196F3;")
+        title.setObjectName("titleLabel")
         layout.addWidget(title)
 
         subtitle = QLabel("Tradutor de Mangá em Tempo Real")
         subtitle.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        subtitle.setStyleSheet(
-            "font-size: 12px; color: #666; padding-bottom: 10px;"
-        )
+        subtitle.setObjectName("subtitleLabel")
         layout.addWidget(subtitle)
 
         # Status
@@ -87,38 +175,26 @@ class SimpleMainWindow(QMainWindow):
         status_layout = QVBoxLayout()
 
         self.status_label = QLabel("✅ Sistema pronto!")
-        self.status_label.setStyleSheet(
-            "font-size: 16px; color: green; padding: 10px;"
-        )
+        self.status_label.setObjectName("statusLabel")
         self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
         self.runtime_label = QLabel("⏱️ Tempo de execução: 00:00:00")
         self.runtime_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.runtime_label.setStyleSheet(
-            "font-size: 11px; color: #555; padding: 5px;"
-        )
+        self.runtime_label.setObjectName("runtimeLabel")
 
         # Estatísticas simples
         stats_hlayout = QHBoxLayout()
         self.translations_label = QLabel("📝 Traduções: 0")
-        self.translations_label.setStyleSheet(
-            "font-size: 11px; padding: 5px;"
-        )
+        self.translations_label.setObjectName("translationsLabel")
 
         self.overlays_label = QLabel("👁️ Overlays: 0")
-        self.overlays_label.setStyleSheet(
-            "font-size: 11px; padding: 5px;"
-        )
+        self.overlays_label.setObjectName("overlaysLabel")
 
         self.cache_label = QLabel("💾 Cache: 0")
-        self.cache_label.setStyleSheet(
-            "font-size: 11px; padding: 5px;"
-        )
+        self.cache_label.setObjectName("cacheLabel")
 
         self.db_size_label = QLabel("💽 DB: 0.00 MB")
-        self.db_size_label.setStyleSheet(
-            "font-size: 11px; padding: 5px;"
-        )
+        self.db_size_label.setObjectName("dbSizeLabel")
 
         stats_hlayout.addWidget(self.translations_label)
         stats_hlayout.addWidget(self.overlays_label)
@@ -131,7 +207,7 @@ class SimpleMainWindow(QMainWindow):
             "💾 Cache: SQLite\n"
             "🖼️ Captura: MSS + Overlay"
         )
-        info_label.setStyleSheet("padding: 10px; font-size: 12px;")
+        info_label.setObjectName("infoLabel")
 
         status_layout.addWidget(self.status_label)
         status_layout.addWidget(self.runtime_label)
@@ -156,25 +232,22 @@ class SimpleMainWindow(QMainWindow):
         test_config_btn = QPushButton("⚙️ Testar Configurações")
         test_config_btn.setMinimumHeight(40)
         test_config_btn.clicked.connect(self.test_config)
-        test_config_btn.setStyleSheet("font-size: 13px;")
+        test_config_btn.setObjectName("testButton")
 
         test_translators_btn = QPushButton("🌐 Testar Tradutores")
         test_translators_btn.setMinimumHeight(40)
         test_translators_btn.clicked.connect(self.test_translators)
-        test_translators_btn.setStyleSheet("font-size: 13px;")
+        test_translators_btn.setObjectName("testButton")
 
         clear_log_btn = QPushButton("🗑️ Limpar Log")
         clear_log_btn.setMinimumHeight(35)
         clear_log_btn.clicked.connect(self.clear_log)
-        clear_log_btn.setStyleSheet("font-size: 12px;")
+        clear_log_btn.setObjectName("clearLogButton")
 
         # Botão START/STOP principal
         self.start_full_btn = QPushButton("🚀 Iniciar Modo Completo")
         self.start_full_btn.setMinimumHeight(50)
-        self.start_full_btn.setStyleSheet(
-            "background-color: #4CAF50; color: white; "
-            "font-size: 14px; font-weight: bold;"
-        )
+        self.start_full_btn.setObjectName("startButton")
         self.start_full_btn.clicked.connect(self.start_full_mode)
 
         test_layout.addWidget(test_config_btn)
@@ -192,10 +265,13 @@ class SimpleMainWindow(QMainWindow):
         self.log_text = QTextEdit()
         self.log_text.setReadOnly(True)
         self.log_text.setMinimumHeight(200)
-        self.log_text.setStyleSheet(
-            "background: #1e1e1e; color: #00ff00; "
-            "font-family: 'Courier New'; font-size: 11px; padding: 8px;"
-        )
+        self.log_text.setObjectName("logView")
+        self.log_text.document().setMaximumBlockCount(_LOG_MAX_LINES)
+        # Log só recebe append: histórico de desfazer e quebra de linha são
+        # custo puro a cada inserção
+        self.log_text.setUndoRedoEnabled(False)
+        self.log_text.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
+        self._vbar = self.log_text.verticalScrollBar()
 
         log_layout.addWidget(self.log_text)
         log_group.setLayout(log_layout)
@@ -207,9 +283,8 @@ class SimpleMainWindow(QMainWindow):
         # Log inicial
         self.log("=" * 60)
         self.log("✅ TradutorOn GUI carregada com sucesso!")
-        self.log(
-            f"🕐 Iniciado em: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}"
-        )
+        started_at = _fast_dmy_hms()
+        self.log(f"🕐 Iniciado em: {started_at}")
         self.log("=" * 60)
         self.log("💡 Use os botões acima para testar o sistema")
         self.log("")
@@ -220,22 +295,31 @@ class SimpleMainWindow(QMainWindow):
 
     def log(self, message: str):
         """Adiciona mensagem ao log."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.append(f"[{timestamp}] {message}")
+        timestamp = _fast_hms()
+        self._log_buffer.append((timestamp, message))
+        if not self.log_flush_timer.isActive():
+            self.log_flush_timer.start()
+
+    def _flush_log(self):
+        """Descarrega as linhas pendentes no QTextEdit de uma só vez."""
+        if not self._log_buffer:
+            return
+        pending = "\n".join(f"[{ts}] {msg}" for ts, msg in self._log_buffer)
+        self._log_buffer.clear()
+        self.log_text.append(pending)
         # Auto-scroll para o final
-        self.log_text.verticalScrollBar().setValue(
-            self.log_text.verticalScrollBar().maximum()
-        )
+        self._vbar.setValue(self._vbar.maximum())
 
     def clear_log(self):
         """Limpa o log."""
+        self._log_buffer.clear()
         self.log_text.clear()
         self.log("🗑️ Log limpo!")
 
     def update_runtime(self):
         """Atualiza tempo de execução."""
-        elapsed = datetime.now() - self.start_time
-        hours, remainder = divmod(int(elapsed.total_seconds()), 3600)
+        elapsed = int(time.monotonic() - self._start_mono)
+        hours, remainder = divmod(elapsed, 3600)
         minutes, seconds = divmod(remainder, 60)
         self.runtime_label.setText(
             f"⏱️ Tempo de execução: {hours:02d}:{minutes:02d}:{seconds:02d}"
@@ -252,7 +336,9 @@ class SimpleMainWindow(QMainWindow):
         self.statusBar().showMessage("⏳ Testando configurações...")
 
         try:
-            settings = SettingsManager()
+            from src.config.settings import get_settings
+
+            settings = get_settings()
 
             # Testar API keys
             groq_key = settings.get_api_key("groq")
@@ -286,9 +372,10 @@ class SimpleMainWindow(QMainWindow):
         self.statusBar().showMessage("⏳ Testando tradutores...")
 
         try:
+            from src.config.settings import get_settings
             from src.translation.translator import TranslationService
 
-            settings = SettingsManager()
+            settings = get_settings()
             groq_key = settings.get_api_key("groq")
 
             service = TranslationService(
@@ -323,7 +410,9 @@ class SimpleMainWindow(QMainWindow):
     def load_saved_area(self) -> bool:
         """Carrega área salva das configurações, se existir."""
         try:
-            settings = SettingsManager()
+            from src.config.settings import get_settings
+
+            settings = get_settings()
             saved_area = settings.get("capture.region")
             if saved_area:
                 self.selected_area = tuple(saved_area)
@@ -347,6 +436,8 @@ class SimpleMainWindow(QMainWindow):
         self.log("🎯 Selecione a área da tela para traduzir...")
         self.statusBar().showMessage("🎯 Selecione a área da tela")
 
+        from src.gui.area_selector import AreaSelector
+
         self.showMinimized()
         self.area_selector = AreaSelector()
         self.area_selector.area_selected.connect(self.on_area_selected)
@@ -359,7 +450,9 @@ class SimpleMainWindow(QMainWindow):
 
         # Salvar nas configurações
         try:
-            settings = SettingsManager()
+            from src.config.settings import get_settings
+
+            settings = get_settings()
             settings.set("capture.region", list(area))
             settings.save()
             save_msg = "💾 Área salva automaticamente!"
@@ -423,21 +516,18 @@ class SimpleMainWindow(QMainWindow):
         if self.translation_overlay:
             self.translation_overlay.clear_all()
         else:
+            from src.gui.translation_overlay import TranslationReplacer
+
             self.translation_overlay = TranslationReplacer(self.selected_area)
         self.translation_overlay.show()
 
         # Atualizar UI
         self.is_running = True
         self.start_full_btn.setText("⏹️ Parar Modo Completo")
-        self.start_full_btn.setStyleSheet(
-            "background-color: #f44336; color: white; "
-            "font-size: 14px; font-weight: bold;"
-        )
+        _set_state(self.start_full_btn, "running")
 
         self.status_label.setText("🔄 Traduzindo em tempo real...")
-        self.status_label.setStyleSheet(
-            "font-size: 16px; color: orange; padding: 10px;"
-        )
+        _set_state(self.status_label, "running")
 
         self.progress_bar.setVisible(True)
         self.statusBar().showMessage("🔄 Pipeline + Overlay rodando...")
@@ -447,7 +537,10 @@ class SimpleMainWindow(QMainWindow):
 
         # Iniciar worker
         try:
-            settings = SettingsManager()
+            from src.config.settings import get_settings
+            from src.pipeline.worker import PipelineWorker
+
+            settings = get_settings()
             self.pipeline_worker = PipelineWorker(self.selected_area, settings)
             self.pipeline_worker.translation_received.connect(
                 self.on_translation_result
@@ -482,15 +575,10 @@ class SimpleMainWindow(QMainWindow):
         # Atualizar UI
         self.is_running = False
         self.start_full_btn.setText("🚀 Iniciar Modo Completo")
-        self.start_full_btn.setStyleSheet(
-            "background-color: #4CAF50; color: white; "
-            "font-size: 14px; font-weight: bold;"
-        )
+        _set_state(self.start_full_btn, "idle")
 
         self.status_label.setText("✅ Sistema pronto!")
-        self.status_label.setStyleSheet(
-            "font-size: 16px; color: green; padding: 10px;"
-        )
+        _set_state(self.status_label, "idle")
 
         self.progress_bar.setVisible(False)
         self.statusBar().showMessage("✅ Pipeline parado")
@@ -522,48 +610,80 @@ class SimpleMainWindow(QMainWindow):
 
             # Adicionar ao histórico em memória
             history_item = {
-                "timestamp": result.get(
-                    "timestamp", datetime.now().strftime("%H:%M:%S")
-                ),
+                "timestamp": result.get("timestamp") or _fast_hms(),
                 "original": original,
                 "translated": translated,
                 "language": language,
                 "provider": provider,
                 "confidence": confidence,
+                "language_upper": language.upper(),
             }
             self.translation_history.append(history_item)
             if len(self.translation_history) > 1000:
                 self.translation_history.pop(0)
 
-            # Log detalhado
-            self.log(
-                f"📝 #{self.translation_count} [{language.upper()}] "
-                f"{original[:50]}..."
-            )
-            self.log(f" → {translated[:80]}")
-            self.log(
-                f" Confiança: {confidence:.1f}% | Provedor: {provider}"
-            )
+            # Log detalhado (pulado se a rajada estourar o orçamento)
+            verbose = self._within_log_budget()
+            if verbose:
+                self.log(
+                    f"📝 #{self.translation_count} [{history_item['language_upper']}] "
+                    f"{original[:50]}..."
+                )
+                self.log(f" → {translated[:80]}")
+                self.log(
+                    f" Confiança: {confidence:.1f}% | Provedor: {provider}"
+                )
 
             # Mostrar no overlay
             if self.translation_overlay and bbox:
                 self.translation_overlay.show_translation(result)
-                self.overlays_label.setText(
-                    f"👁️ Overlays: {self.translation_count}"
-                )
-                self.log(" ✅ Overlay exibido")
+                self.overlay_count = self.translation_count
+                if verbose:
+                    self.log(" ✅ Overlay exibido")
             else:
-                if not bbox:
+                if not bbox and verbose:
                     self.log(" ⚠️ Sem bbox - overlay não exibido")
 
-            # Atualizar contador de traduções
-            self.translations_label.setText(
-                f"📝 Traduções: {self.translation_count}"
-            )
+            # Atualizar contadores (agrupado pelo counter_timer)
+            if not self.counter_timer.isActive():
+                self.counter_timer.start()
         except Exception as e:
             logger.error(f"Erro ao processar resultado: {e}")
             self.log(f" ❌ Erro: {e}")
 
+    def _within_log_budget(self) -> bool:
+        """Indica se a tradução atual ainda cabe no orçamento de log do segundo."""
+        window = int(time.monotonic())
+        if window != self._events_window:
+            self._flush_suppressed_logs()
+            self._events_window = window
+            self._events_this_second = 0
+
+        self._events_this_second += 1
+        if self._events_this_second <= _LOG_BUDGET_PER_SECOND:
+            return True
+
+        if not self._suppressed_logs:
+            # Garante o resumo mesmo se a rajada terminar neste segundo
+            QTimer.singleShot(1000, self._flush_suppressed_logs)
+        self._suppressed_logs += 1
+        return False
+
+    def _flush_suppressed_logs(self):
+        """Registra uma linha resumo com as traduções que não foram logadas."""
+        if self._suppressed_logs:
+            self.log(f"… +{self._suppressed_logs} traduções omitidas do log")
+            self._suppressed_logs = 0
+
+    def _sync_counters(self):
+        """Atualiza os labels de contadores com os valores atuais."""
+        self.translations_label.setText(
+            "📝 Traduções: " + _int_str(self.translation_count)
+        )
+        self.overlays_label.setText(
+            "👁️ Overlays: " + _int_str(self.overlay_count)
+        )
+
     def on_stats_update(self, stats: dict):
         """Atualiza estatísticas básicas na UI."""
         cache_stats = stats.get("cache", {})
@@ -582,6 +702,32 @@ class SimpleMainWindow(QMainWindow):
     # Fechamento seguro
     # ------------------------------------------------------------------ #
 
+    def _resume_runtime_timer(self):
+        """Atualiza o tempo imediatamente e volta a contar a cada segundo."""
+        self.update_runtime()
+        if not self.update_timer.isActive():
+            self.update_timer.start()
+
+    def showEvent(self, event):
+        """Retoma o relógio de execução quando a janela aparece."""
+        super().showEvent(event)
+        if not self.isMinimized():
+            self._resume_runtime_timer()
+
+    def hideEvent(self, event):
+        """Para o relógio de execução enquanto a janela está oculta."""
+        super().hideEvent(event)
+        self.update_timer.stop()
+
+    def changeEvent(self, event):
+        """Para/retoma o relógio ao minimizar/restaurar a janela."""
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange:
+            if self.windowState() & Qt.WindowState.WindowMinimized:
+                self.update_timer.stop()
+            elif self.isVisible():
+                self._resume_runtime_timer()
+
     def closeEvent(self, event):
         """Ao fechar janela, garantir que o pipeline foi parado e overlay limpo."""
         if self.is_running:
@@ -593,6 +739,9 @@ class SimpleMainWindow(QMainWindow):
 
 def main():
     """Função principal."""
+    from PyQt6.QtWidgets import QApplication
+    from src.config.logger import LoggerSetup
+
     # Inicializar logger
     LoggerSetup.initialize(level="INFO")
     logger.info("=" * 60)
@@ -603,6 +752,7 @@ def main():
     app = QApplication(sys.argv)
     app.setApplicationName("TradutorOn")
     app.setStyle("Fusion")
+    app.setStyleSheet(APP_QSS)
 
     # Criar janela
     window = SimpleMainWindow()
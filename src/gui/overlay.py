@@ -2,79 +2,98 @@
 Overlay transparente para exibir traduções na tela.
 """
 
-from PyQt6.QtWidgets import QWidget, QLabel, QVBoxLayout, QApplication
-from PyQt6.QtCore import Qt, QTimer, QPoint, QRect
-from PyQt6.QtGui import QPainter, QColor, QFont
-from typing import Tuple, List, Dict
+from PyQt6.QtWidgets import QWidget, QApplication
+from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QPainter, QColor, QPixmap
+from dataclasses import dataclass
+from typing import Dict, Tuple, List, Optional
+from collections import deque
 from loguru import logger
+import heapq
+import numpy as np
+import itertools
+import time
 
+from src.gui.translation_overlay import TextFitter
 
-class TranslationLabel(QWidget):
-    """Label individual de tradução."""
+# Intervalo do tick do overlay (~60 Hz, taxa de atualização do monitor)
+FRAME_INTERVAL_MS = 16
 
-    def __init__(self, original: str, translated: str, bbox: Tuple):
-        super().__init__()
-        
-        self.original = original
-        self.translated = translated
-        self.bbox = bbox  # (x1, y1, x2, y2)
-        
-        self.init_ui()
+# Intervalo da varredura de expiração
+EXPIRY_INTERVAL_MS = 50
 
-    def init_ui(self):
-        """Inicializa UI."""
-        # Janela sem bordas, sempre no topo
-        self.setWindowFlags(
-            Qt.WindowType.FramelessWindowHint |
-            Qt.WindowType.WindowStaysOnTopHint |
-            Qt.WindowType.Tool
-        )
-        
-        # Fundo semi-transparente
-        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-        
-        # Posicionar sobre o texto original
-        x1, y1, x2, y2 = self.bbox
-        width = x2 - x1
-        height = y2 - y1
-        
-        # Ajustar posição para aparecer abaixo do texto
-        self.setGeometry(int(x1), int(y2 + 5), max(width, 100), 40)
+# Distância (px entre centros) em que a mesma tradução conta como repetida,
+# e lado da célula da grade espacial (2x a distância: vizinhança 3x3 basta)
+DUPLICATE_RADIUS = 20
+GRID_CELL = 2 * DUPLICATE_RADIUS
 
-    def paintEvent(self, event):
-        """Desenha tradução."""
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # Fundo
-        bg_color = QColor(0, 0, 0, 220)
-        painter.fillRect(self.rect(), bg_color)
-        
-        # Borda
-        painter.setPen(QColor(0, 150, 255))
-        painter.drawRect(self.rect().adjusted(0, 0, -1, -1))
-        
-        # Texto
-        font = QFont("Segoe UI", 10, QFont.Weight.Bold)
-        painter.setFont(font)
-        painter.setPen(QColor(255, 255, 255))
-        
-        painter.drawText(
-            self.rect().adjusted(5, 5, -5, -5),
-            Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap,
-            self.translated
-        )
+# Enums do PyQt6 resolvidos uma vez (evita a cadeia de atributos por pintura)
+_TEXT_FLAGS = Qt.AlignmentFlag.AlignCenter
+_ANTIALIASING = QPainter.RenderHint.Antialiasing
+_WINDOW_FLAGS = (
+    Qt.WindowType.FramelessWindowHint |
+    Qt.WindowType.WindowStaysOnTopHint |
+    Qt.WindowType.Tool |
+    Qt.WindowType.WindowTransparentForInput
+)
+
+
+@dataclass
+class TranslationItem:
+    """Tradução desenhada pelo overlay."""
+    original: str
+    translated: str
+    bbox: Tuple  # (x1, y1, x2, y2)
+    # Área do balão em coordenadas do overlay (ints; nenhum QRect por pintura)
+    x: int
+    y: int
+    w: int
+    h: int
+    expires_at: float  # instante monotônico de expiração
+    # Texto já ajustado pelo TextFitter (o mesmo dos balões)
+    font_size: int = 10
+    lines: Tuple[str, ...] = ()
+    line_height: int = 0
+    # Balão já renderizado (fundo, borda e texto); a pintura só copia
+    pixmap: Optional[QPixmap] = None
 
 
 class TranslationOverlay(QWidget):
-    """Overlay principal gerenciando todas as traduções."""
+    """Overlay principal: desenha todas as traduções em um único paintEvent."""
+
+    # Objetos de pintura compartilhados entre todos os itens
+    _BG_COLOR = QColor(0, 0, 0, 220)
+    _BORDER_COLOR = QColor(0, 150, 255)
+    _TEXT_COLOR = QColor(255, 255, 255)
 
     def __init__(self):
         super().__init__()
         
-        self.translations: List[TranslationLabel] = []
+        # Traduções visíveis por chave sequencial (remoção O(1), ordem de inserção)
+        self.translations: Dict[int, TranslationItem] = {}
+        # Traduções recebidas aguardando o próximo tick (limitadas)
+        self.pending: "deque[Tuple[Tuple, str, str]]" = deque(maxlen=256)
         self.auto_hide_ms = 3000  # Esconder após 3s
         
+        # Fila de expiração: heap de (expires_at, chave)
+        self._expiry_heap: List[Tuple[float, int]] = []
+        self._seq = itertools.count()
+        
+        # Grade espacial (célula do centro -> chaves) para achar repetidas
+        # olhando só as células vizinhas, não todos os itens
+        self._grid: Dict[Tuple[int, int], List[int]] = {}
+        
+        # Tick de quadro: adiciona as pendentes de uma vez
+        self.frame_timer = QTimer()
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.setInterval(FRAME_INTERVAL_MS)
+        self.frame_timer.timeout.connect(self._flush_pending)
+        
+        # Timer único de expiração (só roda enquanto há itens visíveis)
+        self.expiry_timer = QTimer()
+        self.expiry_timer.setInterval(EXPIRY_INTERVAL_MS)
+        self.expiry_timer.timeout.connect(self._expire)
+        
         self.init_ui()
         
         logger.info("TranslationOverlay inicializado")
@@ -82,19 +101,22 @@ class TranslationOverlay(QWidget):
     def init_ui(self):
         """Inicializa overlay invisível."""
         # Janela invisível fullscreen
-        self.setWindowFlags(
-            Qt.WindowType.FramelessWindowHint |
-            Qt.WindowType.WindowStaysOnTopHint |
-            Qt.WindowType.Tool |
-            Qt.WindowType.WindowTransparentForInput
-        )
+        self.setWindowFlags(_WINDOW_FLAGS)
         
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
         
-        # Fullscreen
-        screen = QApplication.primaryScreen().geometry()
-        self.setGeometry(screen)
+        # Fullscreen; geometria da tela guardada e só atualizada quando a
+        # tela principal muda
+        self._apply_screen(QApplication.primaryScreen())
+        QApplication.instance().primaryScreenChanged.connect(self._apply_screen)
+
+    def _apply_screen(self, screen):
+        """Cobre a tela principal e guarda sua geometria."""
+        self._screen_rect = screen.geometry()
+        self._origin_x = self._screen_rect.x()
+        self._origin_y = self._screen_rect.y()
+        self.setGeometry(self._screen_rect)
 
     def add_translation(self, bbox: Tuple, original: str, translated: str):
         """
@@ -105,31 +127,198 @@ class TranslationOverlay(QWidget):
             original: Texto original
             translated: Texto traduzido
         """
-        # Criar label
-        label = TranslationLabel(original, translated, bbox)
-        label.show()
-        
-        self.translations.append(label)
+        # Criação adiada para o próximo tick (agrupa rajadas de OCR)
+        self.pending.append((bbox, original, translated))
+        if not self.frame_timer.isActive():
+            self.frame_timer.start()
         
-        # Auto-esconder após delay
-        QTimer.singleShot(self.auto_hide_ms, lambda: self._remove_translation(label))
-        
-        logger.debug(f"Tradução adicionada: {original} → {translated}")
+        # Formatação adiada: o loguru descarta a chamada antes de formatar
+        # quando DEBUG está desabilitado
+        logger.debug("Tradução adicionada: {} → {}", original, translated)
 
-    def _remove_translation(self, label: TranslationLabel):
-        """Remove tradução do overlay."""
-        if label in self.translations:
-            self.translations.remove(label)
-            label.close()
-            label.deleteLater()
+    def show_translations(self, results: List[Dict]):
+        """
+        Adiciona um lote de traduções (dicts com 'bbox', 'original' e
+        'translated'), como add_translation para cada uma.
+        """
+        self.pending.extend(
+            (r['bbox'], r['original'], r['translated']) for r in results
+        )
+        if self.pending and not self.frame_timer.isActive():
+            self.frame_timer.start()
+
+    def _batch_geometry(self, bboxes: List[Tuple]) -> np.ndarray:
+        """
+        Áreas dos balões (abaixo do texto original) em coordenadas do
+        overlay, para o lote todo: linhas (x, y, w, h, cx, cy).
+        """
+        boxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+        geometry = np.empty((len(boxes), 6), dtype=np.int64)
+        # astype trunca em direção a zero, como int()
+        geometry[:, 0] = boxes[:, 0].astype(np.int64) - self._origin_x
+        geometry[:, 1] = (boxes[:, 3] + 5).astype(np.int64) - self._origin_y
+        geometry[:, 2] = np.maximum(boxes[:, 2] - boxes[:, 0], 100).astype(np.int64)
+        geometry[:, 3] = 40
+        geometry[:, 4] = geometry[:, 0] + geometry[:, 2] // 2
+        geometry[:, 5] = geometry[:, 1] + geometry[:, 3] // 2
+        return geometry
+
+    @staticmethod
+    def _center(x: int, y: int, w: int, h: int) -> Tuple[int, int]:
+        """Centro de uma área em coordenadas do overlay."""
+        return x + w // 2, y + h // 2
+
+    def _find_duplicate(self, translated: str, cx: int, cy: int) -> Optional[int]:
+        """Chave de um item visível com o mesmo texto perto de (cx, cy)."""
+        gx, gy = cx // GRID_CELL, cy // GRID_CELL
+        limit = DUPLICATE_RADIUS * DUPLICATE_RADIUS
+        translations = self.translations
+
+        for cell_x in (gx - 1, gx, gx + 1):
+            for cell_y in (gy - 1, gy, gy + 1):
+                for key in self._grid.get((cell_x, cell_y), ()):
+                    item = translations[key]
+                    if item.translated != translated:
+                        continue
+                    ix, iy = self._center(item.x, item.y, item.w, item.h)
+                    if (ix - cx) ** 2 + (iy - cy) ** 2 < limit:
+                        return key
+        return None
+
+    def _grid_remove(self, key: int, item: TranslationItem):
+        """Tira um item da grade espacial."""
+        cx, cy = self._center(item.x, item.y, item.w, item.h)
+        cell = (cx // GRID_CELL, cy // GRID_CELL)
+        keys = self._grid.get(cell)
+        if keys:
+            keys.remove(key)
+            if not keys:
+                del self._grid[cell]
+
+    def _flush_pending(self):
+        """Tick de quadro: cria os itens pendentes e agenda a expiração."""
+        if not self.pending:
+            return
+
+        expires_at = time.monotonic() + self.auto_hide_ms / 1000
+        added = []
+        geometry = self._batch_geometry([bbox for bbox, _, _ in self.pending]).tolist()
+        for (bbox, original, translated), (x, y, w, h, cx, cy) in zip(self.pending, geometry):
+
+            # Mesma tradução já visível no mesmo lugar: só adia a expiração
+            key = self._find_duplicate(translated, cx, cy)
+            if key is not None:
+                self.translations[key].expires_at = expires_at
+                heapq.heappush(self._expiry_heap, (expires_at, key))
+                continue
+
+            font_size, lines, _ = TextFitter.fit_text(
+                translated, w - 10, h - 10, max_font_size=10, padding=0
+            )
+            item = TranslationItem(
+                original, translated, bbox, x, y, w, h, expires_at,
+                font_size=font_size,
+                lines=tuple(lines),
+                line_height=TextFitter.metrics(font_size).height()
+            )
+            item.pixmap = self._render_item(item)
+            key = next(self._seq)
+            self.translations[key] = item
+            self._grid.setdefault((cx // GRID_CELL, cy // GRID_CELL), []).append(key)
+            heapq.heappush(self._expiry_heap, (expires_at, key))
+            added.append(item)
+        self.pending.clear()
+
+        if added:
+            self._update_area(added)
+
+        if not self.isVisible():
+            self.show()
+        if not self.expiry_timer.isActive():
+            self.expiry_timer.start()
+
+    def _expire(self):
+        """Remove do overlay os itens cujo prazo já passou."""
+        heap = self._expiry_heap
+        translations = self.translations
+        now = time.monotonic()
+        expired = []
+
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            item = translations.get(key)
+            # Entrada antiga de um item cuja expiração foi adiada: ignora
+            if item is None or item.expires_at > expires_at:
+                continue
+            del translations[key]
+            self._grid_remove(key, item)
+            expired.append(item)
+
+        if expired:
+            self._update_area(expired)
+
+        if not heap:
+            self.expiry_timer.stop()
+
+    def _update_area(self, items: List[TranslationItem]):
+        """Agenda repintura só da união das áreas dos itens."""
+        left = min(i.x for i in items)
+        top = min(i.y for i in items)
+        right = max(i.x + i.w for i in items)
+        bottom = max(i.y + i.h for i in items)
+        self.update(left, top, right - left, bottom - top)
+
+    def _render_item(self, item: TranslationItem) -> QPixmap:
+        """Renderiza o balão uma vez em um pixmap (na escala da tela)."""
+        cls = TranslationOverlay
+        w, h = item.w, item.h
+        ratio = self.devicePixelRatioF()
+
+        pixmap = QPixmap(round(w * ratio), round(h * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(_ANTIALIASING)
+
+        # Fundo
+        painter.fillRect(0, 0, w, h, cls._BG_COLOR)
+
+        # Borda
+        painter.setPen(cls._BORDER_COLOR)
+        painter.drawRect(0, 0, w - 1, h - 1)
+
+        # Texto (linhas já quebradas, centralizadas no balão)
+        painter.setPen(cls._TEXT_COLOR)
+        painter.setFont(TextFitter.font(item.font_size))
+        line_h = item.line_height
+        line_y = (h - line_h * len(item.lines)) // 2
+        for line in item.lines:
+            painter.drawText(5, line_y, w - 10, line_h, _TEXT_FLAGS, line)
+            line_y += line_h
+
+        painter.end()
+        return pixmap
+
+    def paintEvent(self, event):
+        """Desenha todas as traduções visíveis (cópia dos pixmaps prontos)."""
+        if not self.translations:
+            return
+
+        painter = QPainter(self)
+        for item in self.translations.values():
+            painter.drawPixmap(item.x, item.y, item.pixmap)
+        painter.end()
 
     def clear_all(self):
         """Remove todas as traduções."""
-        for label in self.translations:
-            label.close()
-            label.deleteLater()
-        
+        self.frame_timer.stop()
+        self.expiry_timer.stop()
+        self.pending.clear()
+        self._expiry_heap.clear()
+        self._grid.clear()
         self.translations.clear()
+        self.update()
         logger.debug("Todas as traduções removidas")
 
     def closeEvent(self, event):
@@ -1,25 +1,108 @@
 """Diálogo de configurações."""
+from contextlib import ExitStack
+from functools import lru_cache
+from typing import List, Tuple
+
+# Só o necessário no nível do módulo (diálogo e despacho por tipo de
+# widget); o restante é importado nos métodos que montam a interface
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
-    QLabel, QPushButton, QSpinBox, QDoubleSpinBox,
-    QComboBox, QCheckBox, QLineEdit, QGroupBox, QTabWidget, QWidget
+    QDialog, QVBoxLayout, QHBoxLayout,
+    QComboBox, QCheckBox, QLineEdit, QWidget
 )
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont
+from PyQt6.QtCore import Qt, QSignalBlocker, pyqtSignal
 from loguru import logger
 
+from src.gui.fonts import title_font
+
+
+# Valores padrão de cada configuração do diálogo (fonte única para
+# carregar e para "Restaurar Padrões")
+DEFAULTS = {
+    # Captura
+    'capture.frame_rate': 2,
+    'capture.frame_diff_threshold': 0.08,
+    'capture.frame_diff_method': 'hybrid',
+    
+    # OCR
+    'ocr.languages': ['ja', 'en'],
+    'ocr.use_gpu': False,
+    'ocr.min_confidence': 0.5,
+    
+    # Tradução
+    'translation.target_language': 'pt',
+    'translation.groq_enabled': True,
+    'translation.google_enabled': True,
+    'translation.auto_detect': True,
+    'translation.group_nearby': False,
+    'translation.group_distance': 50,
+    
+    # Overlay
+    'overlay.auto_hide_delay': 5,
+    'overlay.font_size': 14,
+    'overlay.show_original': True,
+    
+    # Cache
+    'cache.max_entries': 1000,
+    'cache.enabled': True,
+}
+
+
+@lru_cache(maxsize=32)
+def _parse_langs(text: str) -> Tuple[str, ...]:
+    """Converte "ja, en" em ('ja', 'en'), ignorando entradas vazias."""
+    return tuple(lang.strip() for lang in text.split(',') if lang.strip())
+
+
+def _add_items_indexed(combo: QComboBox, items: List[str]):
+    """Preenche o combo e guarda um mapa texto -> índice (busca O(1))."""
+    combo.addItems(items)
+    combo._idx = {text: i for i, text in enumerate(items)}
+
+
+def _set_widget_value(widget: QWidget, value):
+    """Aplica um valor de configuração ao widget, conforme o tipo."""
+    if isinstance(widget, QCheckBox):
+        widget.setChecked(value)
+    elif isinstance(widget, QComboBox):
+        idx = getattr(widget, '_idx', None)
+        index = idx.get(value, -1) if idx is not None else widget.findText(value)
+        if index >= 0:
+            widget.setCurrentIndex(index)
+    elif isinstance(widget, QLineEdit):
+        widget.setText(', '.join(value))
+    else:
+        widget.setValue(value)
+
+
+def _widget_value(widget: QWidget):
+    """Lê o valor de configuração atual do widget, conforme o tipo."""
+    if isinstance(widget, QCheckBox):
+        return widget.isChecked()
+    if isinstance(widget, QComboBox):
+        return widget.currentText()
+    if isinstance(widget, QLineEdit):
+        return list(_parse_langs(widget.text()))
+    return widget.value()
+
 
 class SettingsDialog(QDialog):
     """Diálogo de configurações do TradutorOn."""
     
+    settings_loaded = pyqtSignal()  # Emitido uma vez após preencher o formulário
+    
     def __init__(self, settings_manager, parent=None):
         super().__init__(parent)
         self.settings = settings_manager
+        self.changed_keys = {}  # Chaves alteradas no último "Salvar"
+        self._widget_map = {}  # Chave de configuração -> widget (abas construídas)
+        self._tab_keys = {}  # Índice da aba -> chaves dos seus widgets
         self.init_ui()
         self.load_settings()
         
     def init_ui(self):
         """Inicializa interface."""
+        from PyQt6.QtWidgets import QLabel, QPushButton, QTabWidget
+        
         self.setWindowTitle("⚙️ Configurações - TradutorOn")
         self.setMinimumSize(500, 600)
         
@@ -27,37 +110,29 @@ class SettingsDialog(QDialog):
         
         # Título
         title = QLabel("⚙️ Configurações")
-        title_font = QFont()
-        title_font.setPointSize(16)
-        title_font.setBold(True)
-        title.setFont(title_font)
+        title.setFont(title_font(16))
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(title)
         
-        # Tabs
-        tabs = QTabWidget()
-        
-        # Tab 1: Captura
-        capture_tab = self._create_capture_tab()
-        tabs.addTab(capture_tab, "🖼️ Captura")
-        
-        # Tab 2: OCR
-        ocr_tab = self._create_ocr_tab()
-        tabs.addTab(ocr_tab, "🔤 OCR")
-        
-        # Tab 3: Tradução
-        translation_tab = self._create_translation_tab()
-        tabs.addTab(translation_tab, "🌐 Tradução")
-        
-        # Tab 4: Overlay
-        overlay_tab = self._create_overlay_tab()
-        tabs.addTab(overlay_tab, "👁️ Overlay")
-        
-        # Tab 5: Cache
-        cache_tab = self._create_cache_tab()
-        tabs.addTab(cache_tab, "💾 Cache")
-        
-        layout.addWidget(tabs)
+        # Tabs: só a aba visível é construída; as demais ficam como
+        # placeholders e são montadas na primeira vez que forem abertas
+        self.tabs = QTabWidget()
+        self._tab_specs = [
+            ("🖼️ Captura", 'capture', self._create_capture_tab),
+            ("🔤 OCR", 'ocr', self._create_ocr_tab),
+            ("🌐 Tradução", 'translation', self._create_translation_tab),
+            ("👁️ Overlay", 'overlay', self._create_overlay_tab),
+            ("💾 Cache", 'cache', self._create_cache_tab),
+        ]
+        self._built = set()
+        for label, *_ in self._tab_specs:
+            placeholder = QWidget()
+            placeholder_layout = QVBoxLayout(placeholder)
+            placeholder_layout.setContentsMargins(0, 0, 0, 0)
+            self.tabs.addTab(placeholder, label)
+        self.tabs.currentChanged.connect(self._ensure_tab)
+        
+        layout.addWidget(self.tabs)
         
         # Botões
         buttons_layout = QHBoxLayout()
@@ -83,6 +158,8 @@ class SettingsDialog(QDialog):
         
     def _create_capture_tab(self) -> QWidget:
         """Cria tab de captura."""
+        from PyQt6.QtWidgets import QFormLayout, QSpinBox, QDoubleSpinBox
+        
         widget = QWidget()
         layout = QFormLayout(widget)
         
@@ -101,13 +178,21 @@ class SettingsDialog(QDialog):
         
         # Diff method
         self.diff_method_combo = QComboBox()
-        self.diff_method_combo.addItems(["hybrid", "ssim", "mse", "histogram"])
+        _add_items_indexed(self.diff_method_combo, ["hybrid", "ssim", "mse", "histogram"])
         layout.addRow("Método de Detecção:", self.diff_method_combo)
         
+        self._widget_map.update({
+            'capture.frame_rate': self.frame_rate_spin,
+            'capture.frame_diff_threshold': self.diff_threshold_spin,
+            'capture.frame_diff_method': self.diff_method_combo,
+        })
+        
         return widget
         
     def _create_ocr_tab(self) -> QWidget:
         """Cria tab de OCR."""
+        from PyQt6.QtWidgets import QFormLayout, QDoubleSpinBox
+        
         widget = QWidget()
         layout = QFormLayout(widget)
         
@@ -127,16 +212,24 @@ class SettingsDialog(QDialog):
         self.ocr_confidence_spin.setDecimals(2)
         layout.addRow("Confiança Mínima:", self.ocr_confidence_spin)
         
+        self._widget_map.update({
+            'ocr.languages': self.ocr_lang_edit,
+            'ocr.use_gpu': self.ocr_gpu_check,
+            'ocr.min_confidence': self.ocr_confidence_spin,
+        })
+        
         return widget
         
     def _create_translation_tab(self) -> QWidget:
         """Cria tab de tradução."""
+        from PyQt6.QtWidgets import QFormLayout, QSpinBox
+        
         widget = QWidget()
         layout = QFormLayout(widget)
         
         # Target language
         self.target_lang_combo = QComboBox()
-        self.target_lang_combo.addItems(["pt", "en", "es", "fr", "de"])
+        _add_items_indexed(self.target_lang_combo, ["pt", "en", "es", "fr", "de"])
         layout.addRow("Idioma de Destino:", self.target_lang_combo)
         
         # Groq enabled
@@ -161,10 +254,21 @@ class SettingsDialog(QDialog):
         self.group_distance_spin.setSuffix(" px")
         layout.addRow("Distância de Agrupamento:", self.group_distance_spin)
         
+        self._widget_map.update({
+            'translation.target_language': self.target_lang_combo,
+            'translation.groq_enabled': self.groq_enabled_check,
+            'translation.google_enabled': self.google_enabled_check,
+            'translation.auto_detect': self.auto_detect_check,
+            'translation.group_nearby': self.group_text_check,
+            'translation.group_distance': self.group_distance_spin,
+        })
+        
         return widget
         
     def _create_overlay_tab(self) -> QWidget:
         """Cria tab de overlay."""
+        from PyQt6.QtWidgets import QFormLayout, QSpinBox
+        
         widget = QWidget()
         layout = QFormLayout(widget)
         
@@ -184,10 +288,18 @@ class SettingsDialog(QDialog):
         self.overlay_original_check = QCheckBox("Mostrar texto original")
         layout.addRow("", self.overlay_original_check)
         
+        self._widget_map.update({
+            'overlay.auto_hide_delay': self.overlay_hide_spin,
+            'overlay.font_size': self.overlay_font_spin,
+            'overlay.show_original': self.overlay_original_check,
+        })
+        
         return widget
         
     def _create_cache_tab(self) -> QWidget:
         """Cria tab de cache."""
+        from PyQt6.QtWidgets import QFormLayout, QSpinBox
+        
         widget = QWidget()
         layout = QFormLayout(widget)
         
@@ -201,79 +313,92 @@ class SettingsDialog(QDialog):
         self.cache_enabled_check = QCheckBox("Cache habilitado")
         layout.addRow("", self.cache_enabled_check)
         
+        self._widget_map.update({
+            'cache.max_entries': self.cache_max_spin,
+            'cache.enabled': self.cache_enabled_check,
+        })
+        
         return widget
         
+    def _ensure_tab(self, index: int):
+        """Constrói e preenche a aba na primeira vez que ela é exibida."""
+        if index < 0 or index in self._built:
+            return
+        self._built.add(index)
+        
+        _, section, create = self._tab_specs[index]
+        before = set(self._widget_map)
+        self.tabs.widget(index).layout().addWidget(create())
+        self._tab_keys[index] = [k for k in self._widget_map if k not in before]
+        
+        self._load_tab(index, self.settings.get_many(section).get)
+        
+    def _ensure_all_tabs(self):
+        """Constrói todas as abas ainda não visitadas."""
+        for index in range(len(self._tab_specs)):
+            self._ensure_tab(index)
+        
+    def _load_tab(self, index: int, g):
+        """Preenche os widgets da aba e guarda o estado inicial."""
+        widget_map = self._widget_map
+        keys = self._tab_keys[index]
+        
+        # Sem valueChanged/toggled/currentIndexChanged durante o preenchimento
+        with ExitStack() as stack:
+            for key in keys:
+                stack.enter_context(QSignalBlocker(widget_map[key]))
+            for key in keys:
+                _set_widget_value(widget_map[key], g(key, DEFAULTS[key]))
+        
+        # Estado inicial da aba, para salvar só o que mudar
+        self._initial.update(
+            (key, _widget_value(widget_map[key])) for key in keys
+        )
+        
     def load_settings(self):
         """Carrega configurações atuais."""
-        # Captura
-        self.frame_rate_spin.setValue(self.settings.get('capture.frame_rate', 2))
-        self.diff_threshold_spin.setValue(self.settings.get('capture.frame_diff_threshold', 0.08))
-        diff_method = self.settings.get('capture.frame_diff_method', 'hybrid')
-        index = self.diff_method_combo.findText(diff_method)
-        if index >= 0:
-            self.diff_method_combo.setCurrentIndex(index)
-            
-        # OCR
-        ocr_langs = self.settings.get('ocr.languages', ['ja', 'en'])
-        self.ocr_lang_edit.setText(', '.join(ocr_langs))
-        self.ocr_gpu_check.setChecked(self.settings.get('ocr.use_gpu', False))
-        self.ocr_confidence_spin.setValue(self.settings.get('ocr.min_confidence', 0.5))
-        
-        # Tradução
-        target_lang = self.settings.get('translation.target_language', 'pt')
-        index = self.target_lang_combo.findText(target_lang)
-        if index >= 0:
-            self.target_lang_combo.setCurrentIndex(index)
-        self.groq_enabled_check.setChecked(self.settings.get('translation.groq_enabled', True))
-        self.google_enabled_check.setChecked(self.settings.get('translation.google_enabled', True))
-        self.auto_detect_check.setChecked(self.settings.get('translation.auto_detect', True))
-        self.group_text_check.setChecked(self.settings.get('translation.group_nearby', False))
-        self.group_distance_spin.setValue(self.settings.get('translation.group_distance', 50))
-        
-        # Overlay
-        self.overlay_hide_spin.setValue(self.settings.get('overlay.auto_hide_delay', 5))
-        self.overlay_font_spin.setValue(self.settings.get('overlay.font_size', 14))
-        self.overlay_original_check.setChecked(self.settings.get('overlay.show_original', True))
-        
-        # Cache
-        self.cache_max_spin.setValue(self.settings.get('cache.max_entries', 1000))
-        self.cache_enabled_check.setChecked(self.settings.get('cache.enabled', True))
+        # Cada aba lê só a sua seção, achatada em um dict local
+        self.settings.reload_if_changed()
+        self._initial = {}
+        self.changed_keys = {}
+        
+        for index in self._built:
+            section = self._tab_specs[index][1]
+            self._load_tab(index, self.settings.get_many(section).get)
+        
+        self._ensure_tab(self.tabs.currentIndex())
+        self.settings_loaded.emit()
+        
+    def refresh(self):
+        """Recarrega os valores salvos (reuso do diálogo entre aberturas)."""
+        self.load_settings()
+        
+    def _current_values(self) -> dict:
+        """Lê os valores atuais do formulário (só abas já construídas)."""
+        return {key: _widget_value(widget) for key, widget in self._widget_map.items()}
         
     def save_settings(self):
-        """Salva configurações."""
+        """Salva configurações (só as chaves alteradas)."""
         try:
-            # Captura
-            self.settings.set('capture.frame_rate', self.frame_rate_spin.value())
-            self.settings.set('capture.frame_diff_threshold', self.diff_threshold_spin.value())
-            self.settings.set('capture.frame_diff_method', self.diff_method_combo.currentText())
-            
-            # OCR
-            ocr_langs = [lang.strip() for lang in self.ocr_lang_edit.text().split(',')]
-            self.settings.set('ocr.languages', ocr_langs)
-            self.settings.set('ocr.use_gpu', self.ocr_gpu_check.isChecked())
-            self.settings.set('ocr.min_confidence', self.ocr_confidence_spin.value())
-            
-            # Tradução
-            self.settings.set('translation.target_language', self.target_lang_combo.currentText())
-            self.settings.set('translation.groq_enabled', self.groq_enabled_check.isChecked())
-            self.settings.set('translation.google_enabled', self.google_enabled_check.isChecked())
-            self.settings.set('translation.auto_detect', self.auto_detect_check.isChecked())
-            self.settings.set('translation.group_nearby', self.group_text_check.isChecked())
-            self.settings.set('translation.group_distance', self.group_distance_spin.value())
+            initial = self._initial
+            changed = self.changed_keys = {
+                key: value for key, value in self._current_values().items()
+                if initial.get(key) != value
+            }
             
-            # Overlay
-            self.settings.set('overlay.auto_hide_delay', self.overlay_hide_spin.value())
-            self.settings.set('overlay.font_size', self.overlay_font_spin.value())
-            self.settings.set('overlay.show_original', self.overlay_original_check.isChecked())
+            # Nada mudou: não reescreve o arquivo
+            if not changed:
+                logger.info("Configurações inalteradas")
+                self.accept()
+                return
             
-            # Cache
-            self.settings.set('cache.max_entries', self.cache_max_spin.value())
-            self.settings.set('cache.enabled', self.cache_enabled_check.isChecked())
+            self.settings.update(changed)
             
             # Salvar arquivo
             self.settings.save()
+            self._initial.update(changed)
             
-            logger.info("✅ Configurações salvas com sucesso")
+            logger.info(f"✅ Configurações salvas com sucesso ({len(changed)} alteradas)")
             self.accept()
             
         except Exception as e:
@@ -281,20 +406,6 @@ class SettingsDialog(QDialog):
             
     def reset_defaults(self):
         """Restaura configurações padrão."""
-        self.frame_rate_spin.setValue(2)
-        self.diff_threshold_spin.setValue(0.08)
-        self.diff_method_combo.setCurrentText('hybrid')
-        self.ocr_lang_edit.setText('ja, en')
-        self.ocr_gpu_check.setChecked(False)
-        self.ocr_confidence_spin.setValue(0.5)
-        self.target_lang_combo.setCurrentText('pt')
-        self.groq_enabled_check.setChecked(True)
-        self.google_enabled_check.setChecked(True)
-        self.auto_detect_check.setChecked(True)
-        self.group_text_check.setChecked(False)
-        self.group_distance_spin.setValue(50)
-        self.overlay_hide_spin.setValue(5)
-        self.overlay_font_spin.setValue(14)
-        self.overlay_original_check.setChecked(True)
-        self.cache_max_spin.setValue(1000)
-        self.cache_enabled_check.setChecked(True)
+        self._ensure_all_tabs()
+        for key, widget in self._widget_map.items():
+            _set_widget_value(widget, DEFAULTS[key])
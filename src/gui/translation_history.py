@@ -1,12 +1,208 @@
 """Painel de histórico de traduções."""
-from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout, QTextEdit,
-    QPushButton, QLabel, QTableWidget, QTableWidgetItem,
-    QHeaderView
+# Widgets da interface são importados em init_ui
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout
+from PyQt6.QtCore import (
+    Qt, QAbstractTableModel, QModelIndex, QObject, QThread, pyqtSignal
 )
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QFont
 from datetime import datetime
+from pathlib import Path
+from typing import Optional, Tuple
+
+from src.gui.fonts import title_font
+from src.utils.history_log import HistoryLog
+
+
+class CsvExportWorker(QObject):
+    """Exporta o histórico em CSV fora da thread da GUI."""
+    
+    progress = pyqtSignal(int)  # Linhas escritas até agora
+    finished = pyqtSignal(str)  # Caminho do arquivo exportado
+    failed = pyqtSignal(str)  # Mensagem de erro
+    
+    CHUNK_ROWS = 500  # Linhas por lote (um sinal de progresso por lote)
+    
+    # Chave do histórico -> cabeçalho da coluna no CSV
+    COLUMNS = HistoryLog.COLUMNS
+    
+    def __init__(self, history: list, filename: str, source: Optional[Tuple[Path, int]] = None):
+        """
+        Args:
+            history: Itens a escrever quando não há CSV da sessão
+            filename: Arquivo de destino
+            source: (CSV da sessão, bytes a copiar) de HistoryLog.snapshot()
+        """
+        super().__init__()
+        self.history = history
+        self.filename = filename
+        self.source = source
+        
+    def run(self):
+        """Executa a exportação (chamado pelo started da QThread)."""
+        try:
+            if self.source is not None:
+                self._copy_session()
+            else:
+                self._write_rows()
+            self.finished.emit(self.filename)
+            
+        except Exception as e:
+            self.failed.emit(str(e))
+            
+    def _copy_session(self):
+        """Copia o CSV da sessão (custo de cópia de arquivo, sem loop por linha)."""
+        import os
+        import shutil
+        path, size = self.source
+        shutil.copyfile(path, self.filename)
+        # Descarta o que a GUI gravou depois do snapshot (pode ser linha parcial)
+        os.truncate(self.filename, size)
+        
+    def _write_rows(self):
+        """Escreve os itens em memória (CSV da sessão desativado)."""
+        import csv
+        history = self.history
+        # Buffer de 1 MiB: poucas syscalls mesmo em históricos grandes
+        with open(self.filename, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+            # Escreve direto dos dicts do histórico (chaves extras ignoradas)
+            writer = csv.DictWriter(
+                f, fieldnames=list(self.COLUMNS), restval='', extrasaction='ignore'
+            )
+            writer.writerow(self.COLUMNS)
+            
+            for start in range(0, len(history), self.CHUNK_ROWS):
+                end = start + self.CHUNK_ROWS
+                writer.writerows(history[start:end])
+                self.progress.emit(min(end, len(history)))
+
+
+class HistoryModel(QAbstractTableModel):
+    """
+    Modelo da tabela de histórico, lido direto da lista de dicts.
+    
+    Traduções repetidas em sequência (mesmo texto recapturado) viram uma
+    única linha com contador na coluna "Qtd"; o histórico bruto não é alterado.
+    """
+    
+    HEADERS = ["Hora", "Original", "Tradução", "Idioma", "Provedor", "Qtd"]
+    FETCH_BATCH = 200  # Linhas expostas à view por vez
+    
+    def __init__(self, history: list, parent=None):
+        super().__init__(parent)
+        self.history = history
+        # Cópia do histórico tirada em reload: a lista original continua
+        # recebendo append/pop(0) com o diálogo aberto, o que deslocaria os
+        # índices entre um fetchMore e outro
+        self._items = []
+        self._rows = []  # [item, repetições] por linha exibida
+        self._last_key = None  # Chave de agrupamento da última linha
+        self._scanned = 0  # Itens da cópia já agrupados
+        
+    @staticmethod
+    def _row_key(item: dict) -> tuple:
+        get = item.get
+        return (get('original'), get('translated'), get('language'), get('provider'))
+        
+    def _scan(self, max_rows: int) -> int:
+        """
+        Agrupa itens do histórico em até max_rows linhas novas.
+        
+        Repetições seguidas da última linha são sempre absorvidas antes de
+        parar, para que uma linha já exibida não mude de contagem depois.
+        
+        Returns:
+            Número de linhas novas
+        """
+        items = self._items
+        rows = self._rows
+        last_key = self._last_key
+        scanned = self._scanned
+        limit = len(items)
+        added = 0
+        
+        while scanned < limit:
+            item = items[scanned]
+            key = self._row_key(item)
+            if rows and key == last_key:
+                rows[-1][1] += 1
+            elif added == max_rows:
+                break
+            else:
+                rows.append([item, 1])
+                last_key = key
+                added += 1
+            scanned += 1
+        
+        self._last_key = last_key
+        self._scanned = scanned
+        return added
+        
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+        
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._scanned < len(self._items)
+        
+    def fetchMore(self, parent=QModelIndex()):
+        """Expõe o próximo lote de linhas quando a rolagem chega ao fim."""
+        if parent.isValid():
+            return
+        first = len(self._rows)
+        # Agrupa antes de avisar a view (as contagens da última linha podem mudar)
+        added = self._scan(self.FETCH_BATCH)
+        if added <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), first, first + added - 1)
+        self.endInsertRows()
+        
+    def reload(self, count: Optional[int] = None):
+        """Volta a expor só o primeiro lote do histórico atual."""
+        self.beginResetModel()
+        self._items = list(self.history) if count is None else self.history[:count]
+        self._rows = []
+        self._last_key = None
+        self._scanned = 0
+        self._scan(self.FETCH_BATCH)
+        self.endResetModel()
+        
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+        
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        """Texto da célula, gerado só quando a view pede."""
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        
+        item, repeats = self._rows[index.row()]
+        get = item.get
+        column = index.column()
+        if column == 0:
+            return get('timestamp', '')
+        # Textos inteiros: a view corta (elide) pela largura da coluna
+        if column == 1:
+            return get('original', '')
+        if column == 2:
+            return get('translated', '')
+        if column == 3:
+            upper = get('language_upper')
+            return upper if upper is not None else get('language', '?').upper()
+        if column == 4:
+            return get('provider', '?')
+        return f"×{repeats}" if repeats > 1 else ""
+        
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+        
+    def clear(self):
+        """Esvazia o histórico notificando a view."""
+        self.beginResetModel()
+        self.history.clear()
+        self._items = []
+        self._rows = []
+        self._last_key = None
+        self._scanned = 0
+        self.endResetModel()
 
 
 class TranslationHistoryDialog(QDialog):
@@ -15,38 +211,44 @@ class TranslationHistoryDialog(QDialog):
     def __init__(self, history: list, parent=None):
         super().__init__(parent)
         self.history = history
-        self.init_ui()
-        self.load_history()
+        self._export_thread = None
+        self._export_worker = None
+        count = len(history)
+        self.init_ui(count)
+        self.load_history(count)
         
-    def init_ui(self):
+    def init_ui(self, count: int):
         """Inicializa interface."""
+        from PyQt6.QtWidgets import (
+            QPushButton, QLabel, QTableView, QHeaderView, QAbstractItemView
+        )
+        
         self.setWindowTitle("📚 Histórico de Traduções")
         self.setMinimumSize(800, 600)
         
         layout = QVBoxLayout(self)
         
         # Título
-        title = QLabel(f"📚 Histórico de Traduções ({len(self.history)} itens)")
-        title_font = QFont()
-        title_font.setPointSize(14)
-        title_font.setBold(True)
-        title.setFont(title_font)
+        title = QLabel(f"📚 Histórico de Traduções ({count} itens)")
+        title.setFont(title_font(14))
         layout.addWidget(title)
         
-        # Tabela
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels([
-            "Hora", "Original", "Tradução", "Idioma", "Provedor"
-        ])
+        # Tabela (células geradas sob demanda pelo modelo)
+        self.model = HistoryModel(self.history, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        # Textos longos terminam em "…" na largura real da coluna (em pixels,
+        # certo também para CJK), em vez de cortados por caracteres
+        self.table.setWordWrap(False)
+        self.table.setTextElideMode(Qt.TextElideMode.ElideRight)
         
-        # Configurar colunas
+        # Configurar colunas (Original e Tradução esticam; o resto se ajusta)
         header = self.table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
-        header.setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
-        header.setSectionResizeMode(4, QHeaderView.ResizeMode.ResizeToContents)
+        fit = QHeaderView.ResizeMode.ResizeToContents
+        stretch = QHeaderView.ResizeMode.Stretch
+        for column, mode in enumerate((fit, stretch, stretch, fit, fit, fit)):
+            header.setSectionResizeMode(column, mode)
         
         layout.addWidget(self.table)
         
@@ -69,30 +271,9 @@ class TranslationHistoryDialog(QDialog):
         
         layout.addLayout(buttons_layout)
         
-    def load_history(self):
-        """Carrega histórico na tabela."""
-        self.table.setRowCount(len(self.history))
-        
-        for i, item in enumerate(self.history):
-            # Hora
-            timestamp = item.get('timestamp', '')
-            self.table.setItem(i, 0, QTableWidgetItem(timestamp))
-            
-            # Original
-            original = item.get('original', '')[:100]
-            self.table.setItem(i, 1, QTableWidgetItem(original))
-            
-            # Tradução
-            translated = item.get('translated', '')[:100]
-            self.table.setItem(i, 2, QTableWidgetItem(translated))
-            
-            # Idioma
-            language = item.get('language', '?')
-            self.table.setItem(i, 3, QTableWidgetItem(language.upper()))
-            
-            # Provedor
-            provider = item.get('provider', '?')
-            self.table.setItem(i, 4, QTableWidgetItem(provider))
+    def load_history(self, count: Optional[int] = None):
+        """Recarrega a tabela a partir do histórico."""
+        self.model.reload(count)
             
     def export_csv(self):
         """Exporta histórico para CSV."""
@@ -105,28 +286,62 @@ class TranslationHistoryDialog(QDialog):
             "CSV Files (*.csv)"
         )
         
-        if filename:
-            try:
-                import csv
-                with open(filename, 'w', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(['Hora', 'Original', 'Tradução', 'Idioma', 'Provedor'])
-                    
-                    for item in self.history:
-                        writer.writerow([
-                            item.get('timestamp', ''),
-                            item.get('original', ''),
-                            item.get('translated', ''),
-                            item.get('language', ''),
-                            item.get('provider', '')
-                        ])
-                        
-                from PyQt6.QtWidgets import QMessageBox
-                QMessageBox.information(self, "Sucesso", f"Histórico exportado para:\n{filename}")
-                
-            except Exception as e:
-                from PyQt6.QtWidgets import QMessageBox
-                QMessageBox.critical(self, "Erro", f"Erro ao exportar:\n{e}")
+        if not filename:
+            return
+        
+        from PyQt6.QtWidgets import QProgressDialog
+        
+        # Exporta a sessão inteira copiando o CSV append-only do HistoryLog
+        # (inclui itens que já saíram da lista em memória). Sem ele, escreve
+        # uma cópia da lista, que continua crescendo durante a exportação
+        snapshot = getattr(self.history, 'snapshot', None)
+        source = snapshot() if snapshot is not None else None
+        history = [] if source is not None else list(self.history)
+        
+        # Na cópia do arquivo não há progresso por linha (barra indeterminada)
+        progress = QProgressDialog("Exportando histórico...", None, 0, len(history), self)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        
+        thread = QThread(self)
+        worker = CsvExportWorker(history, filename, source)
+        worker.moveToThread(thread)
+        
+        thread.started.connect(worker.run)
+        worker.progress.connect(progress.setValue)
+        worker.finished.connect(self._on_export_finished)
+        worker.failed.connect(self._on_export_failed)
+        worker.finished.connect(thread.quit)
+        worker.failed.connect(thread.quit)
+        thread.finished.connect(progress.close)
+        thread.finished.connect(self._on_export_thread_done)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        
+        # Referências mantidas até o fim da thread
+        self._export_thread = thread
+        self._export_worker = worker
+        thread.start()
+        
+    def _on_export_thread_done(self):
+        """Solta as referências da exportação concluída."""
+        self._export_thread = None
+        self._export_worker = None
+        
+    def done(self, result):
+        """Aguarda uma exportação em andamento antes de fechar."""
+        if self._export_thread is not None:
+            self._export_thread.wait()
+        super().done(result)
+        
+    def _on_export_finished(self, filename: str):
+        """Avisa o fim da exportação."""
+        from PyQt6.QtWidgets import QMessageBox
+        QMessageBox.information(self, "Sucesso", f"Histórico exportado para:\n{filename}")
+        
+    def _on_export_failed(self, error: str):
+        """Avisa erro na exportação."""
+        from PyQt6.QtWidgets import QMessageBox
+        QMessageBox.critical(self, "Erro", f"Erro ao exportar:\n{error}")
                 
     def clear_history(self):
         """Limpa histórico."""
@@ -140,6 +355,5 @@ class TranslationHistoryDialog(QDialog):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            self.history.clear()
-            self.table.setRowCount(0)
+            self.model.clear()
             QMessageBox.information(self, "Sucesso", "Histórico limpo!")
@@ -1,15 +1,102 @@
 
+import numpy as np
 from PyQt6.QtWidgets import QWidget, QLabel, QVBoxLayout
-from PyQt6.QtCore import Qt, QTimer, QRect, QSize, QPropertyAnimation, QEasingCurve, pyqtProperty
-from PyQt6.QtGui import QPainter, QColor, QFont, QFontMetrics
+from PyQt6.QtCore import Qt, QObject, QTimer, QRect, QSize
+from PyQt6.QtGui import QPainter, QColor, QFont, QFontMetrics, QRegion, QStaticText, QTransform
 from loguru import logger
 from typing import List, Dict, Tuple, Optional
-from datetime import datetime
+from functools import lru_cache
+from collections import deque
+import threading
+import time
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Tempo que um balão fica visível antes do fade out
+BALLOON_LIFETIME_S = 26.0
+
+# Duração do fade out dos balões e intervalo do timer compartilhado (~30 FPS)
+FADE_DURATION_MS = 300
+FADE_INTERVAL_MS = 33
+
+# Máximo de resultados aguardando agrupamento
+PENDING_LIMIT = 256
+
+# Balões removidos guardados para reuso (em vez de criar/destruir um por texto)
+BALLOON_POOL_SIZE = 32
+
+# Fontes e métricas do texto dos balões, por tamanho (família/peso fixos).
+# Criadas sob demanda, já que precisam da QApplication. Um cache por thread:
+# QFont/QFontMetrics são reentrantes, não thread-safe, e o ajuste de texto
+# também roda nas threads do pipeline (TextFitter.preshape)
+_qt_cache = threading.local()
+
+
+def _get_font(size: int) -> QFont:
+    """Retorna a fonte dos balões no tamanho pedido (cacheada na thread)."""
+    cache = getattr(_qt_cache, "fonts", None)
+    if cache is None:
+        cache = _qt_cache.fonts = {}
+    font = cache.get(size)
+    if font is None:
+        cache[size] = font = QFont("Arial", size, QFont.Weight.Bold)
+    return font
+
+
+def _get_metrics(size: int) -> QFontMetrics:
+    """Retorna as métricas da fonte dos balões no tamanho pedido (cacheadas na thread)."""
+    cache = getattr(_qt_cache, "metrics", None)
+    if cache is None:
+        cache = _qt_cache.metrics = {}
+    metrics = cache.get(size)
+    if metrics is None:
+        cache[size] = metrics = QFontMetrics(_get_font(size))
+    return metrics
+
+
+def _size_bucket(size: int) -> int:
+    """
+    Arredonda para baixo em múltiplos de 8 px (mais acertos no cache de
+    ajuste). Tamanhos pequenos ficam exatos: lá 8 px mudam o resultado.
+    """
+    return size if size < 64 else size & ~7
 
 
 class TextFitter:
     """Calcula tamanho de fonte ideal para caber no espaço do balão."""
 
+    @staticmethod
+    def font(size: int) -> QFont:
+        """Fonte usada no ajuste, no tamanho pedido."""
+        return _get_font(size)
+
+    @staticmethod
+    def metrics(size: int) -> QFontMetrics:
+        """Métricas da fonte usada no ajuste."""
+        return _get_metrics(size)
+
+    @staticmethod
+    def preshape(text: str, bbox) -> Optional[Tuple[int, Tuple[str, ...], Tuple[int, ...]]]:
+        """
+        Ajuste do texto de um balão de um só resultado, com os mesmos
+        parâmetros do BalloonTextReplacement. Pode rodar fora da thread da
+        GUI (o worker adianta o trabalho). Retorna None se o bbox é inválido.
+        """
+        try:
+            w = int(max(float(bbox[2]), 40))
+            h = int(max(float(bbox[3]), 20))
+        except (TypeError, ValueError, IndexError):
+            return None
+        font_size, lines, widths = TextFitter.fit_text(
+            text, w, h, max_font_size=13, min_font_size=6, padding=4
+        )
+        return font_size, tuple(lines), tuple(widths)
+
     @staticmethod
     def fit_text(
         text: str,
@@ -18,99 +105,266 @@ class TextFitter:
         max_font_size: int = 13,
         min_font_size: int = 6,
         padding: int = 4
-    ) -> Tuple[int, List[str]]:
+    ) -> Tuple[int, List[str], List[int]]:
         """
         Calcula o melhor tamanho de fonte.
+
+        Retorna (tamanho, linhas, largura de cada linha).
         """
-        
+        font_size, lines, widths = TextFitter._fit_cached(
+            text,
+            _size_bucket(int(available_width)),
+            _size_bucket(int(available_height)),
+            max_font_size,
+            min_font_size,
+            padding
+        )
+        return font_size, list(lines), list(widths)
+
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _fit_cached(
+        text: str,
+        available_width: int,
+        available_height: int,
+        max_font_size: int,
+        min_font_size: int,
+        padding: int
+    ) -> Tuple[int, Tuple[str, ...], Tuple[int, ...]]:
+        """Ajuste memoizado; guarda só ints e strings (nada de objetos Qt)."""
         effective_width = available_width - (2 * padding)
         effective_height = available_height - (2 * padding)
 
+        def fallback(line: str):
+            return min_font_size, (line,), (_get_metrics(min_font_size).horizontalAdvance(line),)
+
         if effective_width <= 10 or effective_height <= 10:
-            return min_font_size, [text[:20]]
+            return fallback(text[:20])
 
-        # Tentar tamanhos de fonte do maior para o menor
-        for font_size in range(max_font_size, min_font_size - 1, -1):
-            font = QFont("Arial", font_size, QFont.Weight.Bold)
-            metrics = QFontMetrics(font)
+        # Busca binária pelo maior tamanho que cabe (caber é monotônico:
+        # se o tamanho k cabe, todo tamanho menor também cabe)
+        lo, hi = min_font_size, max_font_size
+        best = None
+        while lo <= hi:
+            font_size = (lo + hi) // 2
+            metrics = _get_metrics(font_size)
 
             # Quebrar texto em linhas
-            lines = TextFitter._break_text(text, metrics, effective_width)
+            lines, widths = TextFitter._break_text(text, metrics, effective_width)
 
             # Calcular altura necessária
             line_height = metrics.height()
             total_height = len(lines) * line_height
 
-            # Se cabe, usar este tamanho
+            # Se cabe, guardar e tentar maior; senão, tentar menor
             if total_height <= effective_height and len(lines) <= 5:
-                return font_size, lines
+                best = (font_size, tuple(lines), tuple(widths))
+                lo = font_size + 1
+            else:
+                hi = font_size - 1
 
-        return min_font_size, [text[:30]]
+        return best or fallback(text[:30])
 
     @staticmethod
-    def _break_text(text: str, metrics: QFontMetrics, max_width: int) -> List[str]:
-        """Quebra texto em múltiplas linhas."""
+    def _break_text(
+        text: str,
+        metrics: QFontMetrics,
+        max_width: int
+    ) -> Tuple[List[str], List[int]]:
+        """Quebra texto em múltiplas linhas; retorna também a largura de cada uma."""
         
         words = text.split()
+        advance = metrics.horizontalAdvance
+
+        # Nada a quebrar: uma palavra só, ou o texto inteiro já cabe
+        if len(words) <= 1:
+            line = words[0] if words else text[:20]
+            return [line], [advance(line)]
+        single_line = " ".join(words)
+        single_width = advance(single_line)
+        if single_width <= max_width:
+            return [single_line], [single_width]
+
+        # Largura de cada palavra, medida uma vez (repetidas, só na primeira)
+        space_width = advance(" ")
+        word_widths: Dict[str, int] = {}
+        widths = []
+        for word in words:
+            word_width = word_widths.get(word)
+            if word_width is None:
+                word_widths[word] = word_width = advance(word)
+            widths.append(word_width)
+
+        # Quebra gulosa: dá o menor número de linhas possível
         lines = []
+        line_widths = []
         current_line = ""
+        current_width = 0
 
-        for word in words:
-            test_line = current_line + (" " if current_line else "") + word
-            
-            if metrics.horizontalAdvance(test_line) <= max_width:
-                current_line = test_line
+        for word, word_width in zip(words, widths):
+            if not current_line:
+                current_line = word
+                current_width = word_width
+            elif current_width + space_width + word_width <= max_width:
+                current_line += " " + word
+                current_width += space_width + word_width
             else:
-                if current_line:
-                    lines.append(current_line)
+                lines.append(current_line)
+                line_widths.append(current_width)
                 current_line = word
+                current_width = word_width
 
         if current_line:
             lines.append(current_line)
+            line_widths.append(current_width)
+
+        # Com o mesmo número de linhas, equilibra as larguras (o balão fica
+        # mais estreito e uniforme); acima de 5 linhas o fit_text já rejeita
+        if 2 <= len(lines) <= 5:
+            balanced = TextFitter._balance_lines(
+                words, widths, space_width, max_width, len(lines)
+            )
+            if balanced:
+                return balanced
 
-        return lines if lines else [text[:20]]
+        return lines, line_widths
 
+    @staticmethod
+    def _balance_lines(
+        words: List[str],
+        widths: List[int],
+        space_width: int,
+        max_width: int,
+        line_count: int
+    ) -> Optional[Tuple[List[str], List[int]]]:
+        """
+        Quebra ótima em exatamente line_count linhas: minimiza a soma dos
+        quadrados das sobras de cada linha (programação dinâmica).
+        """
+        n = len(words)
+        prefix = [0]
+        for width in widths:
+            prefix.append(prefix[-1] + width)
+
+        inf = float('inf')
+        cost = [[inf] * (n + 1) for _ in range(line_count + 1)]
+        split = [[0] * (n + 1) for _ in range(line_count + 1)]
+        cost[0][0] = 0
+
+        for k in range(1, line_count + 1):
+            # Sobra ao menos uma palavra para cada linha seguinte
+            for i in range(k, n - (line_count - k) + 1):
+                # Linha k = words[j:i]; cresce para a esquerda até não caber
+                for j in range(i - 1, k - 2, -1):
+                    line_width = prefix[i] - prefix[j] + (i - j - 1) * space_width
+                    if line_width > max_width and i - j > 1:
+                        break
+                    previous = cost[k - 1][j]
+                    if previous == inf:
+                        continue
+                    gap = max_width - line_width
+                    total = previous + gap * gap
+                    if total < cost[k][i]:
+                        cost[k][i] = total
+                        split[k][i] = j
+
+        if cost[line_count][n] == inf:
+            return None
 
-class BalloonTextReplacement(QWidget):
+        lines = []
+        line_widths = []
+        i = n
+        for k in range(line_count, 0, -1):
+            j = split[k][i]
+            lines.append(" ".join(words[j:i]))
+            line_widths.append(prefix[i] - prefix[j] + (i - j - 1) * space_width)
+            i = j
+        lines.reverse()
+        line_widths.reverse()
+        return lines, line_widths
+
+
+class BalloonTextReplacement(QObject):
     """
     Renderiza APENAS o texto com fundo branco atrás das letras.
     Sem quadrado gigante - bem mais elegante!
+
+    Não é uma janela: o TranslationReplacer (parent) desenha todos os
+    balões em um único paintEvent. Ao sair da tela, o balão volta para o
+    pool do overlay e é reaproveitado via reset().
     """
 
+    # Alpha inicial do texto e do fundo (o fade interpola até 0)
+    TEXT_ALPHA = 255
+    BG_ALPHA = 240
+
+    # Abaixo deste alpha do texto (~5%) o balão é invisível: não desenha
+    MIN_VISIBLE_ALPHA = 13
+
     def __init__(
         self,
         bbox: Tuple[int, int, int, int],
         translated_text: str,
         original_text: str = "",
-        parent=None
+        parent=None,
+        fitted: Optional[Tuple[int, Tuple[str, ...], Tuple[int, ...]]] = None
     ):
         super().__init__(parent)
 
+        # Cores do texto e do fundo; o fade só ajusta o alpha
+        self._text_color = QColor(0, 0, 0, self.TEXT_ALPHA)
+        self._bg_color = QColor(255, 255, 255, self.BG_ALPHA)
+        self.reset(bbox, translated_text, original_text, fitted)
+
+    def reset(
+        self,
+        bbox: Tuple[int, int, int, int],
+        translated_text: str,
+        original_text: str = "",
+        fitted: Optional[Tuple[int, Tuple[str, ...], Tuple[int, ...]]] = None
+    ):
+        """(Re)configura o balão para um novo texto."""
         self.bbox = bbox
         self.translated_text = translated_text
         self.original_text = original_text
-        self._opacity = 1.0
-        self.created_at = datetime.now()
+        self.fade_started = 0.0
+        self.set_alpha(self.TEXT_ALPHA, self.BG_ALPHA)
+        self.created_at = time.monotonic()
 
         x, y, w, h = bbox
 
-        # Calcular tamanho de fonte ideal
-        self.font_size, self.lines = TextFitter.fit_text(
-            translated_text,
-            w,
-            h,
-            max_font_size=13,
-            min_font_size=6,
-            padding=4
-        )
+        # Calcular tamanho de fonte ideal (ou usar o já calculado no worker)
+        if fitted:
+            self.font_size, self.lines, line_widths = fitted[0], list(fitted[1]), list(fitted[2])
+        else:
+            self.font_size, self.lines, line_widths = TextFitter.fit_text(
+                translated_text,
+                w,
+                h,
+                max_font_size=13,
+                min_font_size=6,
+                padding=4
+            )
 
         # Calcular tamanho necessário para renderizar o texto
-        font = QFont("Arial", self.font_size, QFont.Weight.Bold)
-        metrics = QFontMetrics(font)
-        
+        metrics = _get_metrics(self.font_size)
+
+        # Medidas fixas do balão: paint() (chamado a cada quadro do fade)
+        # só reaproveita, sem medir de novo (larguras já vêm da quebra)
+        self._font = _get_font(self.font_size)
+        self._line_widths = line_widths
+        self._line_height = line_height = metrics.height()
+
+        # Layout dos glifos feito uma vez; drawStaticText só reaproveita
+        self._static_lines = []
+        for line in self.lines:
+            static = QStaticText(line)
+            static.setTextFormat(Qt.TextFormat.PlainText)
+            static.prepare(QTransform(), self._font)
+            self._static_lines.append(static)
+
         # Calcular largura do texto
-        max_line_width = max(metrics.horizontalAdvance(line) for line in self.lines)
-        line_height = metrics.height()
+        max_line_width = max(self._line_widths)
         total_height = len(self.lines) * line_height
 
         # Tamanho final (ajustado ao texto, não ao bbox original)
@@ -121,112 +375,186 @@ class BalloonTextReplacement(QWidget):
         center_x = x + (w - text_width) // 2
         center_y = y + (h - text_height) // 2
 
-        self.setGeometry(center_x, center_y, text_width, text_height)
+        # Retângulo nas coordenadas do overlay (deslocado para dentro dele
+        # se o texto passar da borda)
+        self.rect = QRect(center_x, center_y, text_width, text_height)
+        parent = self.parent()
+        if parent is not None:
+            area = parent.geometry()
+            self.rect.moveLeft(max(area.left(), min(self.rect.left(), area.right() + 1 - text_width)))
+            self.rect.moveTop(max(area.top(), min(self.rect.top(), area.bottom() + 1 - text_height)))
+            self.rect.translate(-area.x(), -area.y())
 
-        self._setup_ui()
-
-        # Auto-hide após 10 segundos
-        self.hide_timer = QTimer()
-        self.hide_timer.timeout.connect(self.start_fade_out)
-        self.hide_timer.setSingleShot(True)
-        self.hide_timer.start(26000)
+        # Auto-hide: o overlay inicia o fade quando o prazo vence
+        self.expires_at = time.monotonic() + BALLOON_LIFETIME_S
 
         logger.debug(
             f"🎈 Texto: {original_text[:30]} → {translated_text[:30]} "
             f"(fonte: {self.font_size}pt, tamanho: {text_width}x{text_height})"
         )
 
-    def _setup_ui(self):
-        """Configura window flags."""
-        self.setWindowFlags(
-            Qt.WindowType.FramelessWindowHint |
-            Qt.WindowType.WindowStaysOnTopHint |
-            Qt.WindowType.Tool
-        )
-        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-        self.setAttribute(Qt.WidgetAttribute.WA_ShowWithoutActivating)
-
-    def paintEvent(self, event):
+    def paint(self, painter: QPainter):
         """Desenha APENAS o texto com fundo branco atrás."""
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        painter.setFont(self._font)
+        painter.setPen(self._text_color)
+        bg_color = self._bg_color
 
-        # Fonte
-        font = QFont("Arial", self.font_size, QFont.Weight.Bold)
-        painter.setFont(font)
-
-        # Cor do texto
-        text_color = QColor(0, 0, 0, int(255 * self._opacity))
-        painter.setPen(text_color)
-
-        # Fundo branco
-        bg_color = QColor(255, 255, 255, int(240 * self._opacity))
-
-        metrics = QFontMetrics(font)
-        line_height = metrics.height()
+        line_height = self._line_height
         padding = 4
 
         # Desenhar cada linha
-        y_offset = padding
-        for i, line in enumerate(self.lines):
-            # Calcular bbox para esta linha
-            line_width = metrics.horizontalAdvance(line)
-            
+        left, top, width = self.rect.x(), self.rect.y(), self.rect.width()
+        y_offset = top + padding
+        for static, line_width in zip(self._static_lines, self._line_widths):
+            line_x = left + (width - line_width) // 2
+
             # Desenhar fundo branco ATRÁS do texto
             bg_rect = QRect(
-                (self.width() - line_width) // 2 - 2,
+                line_x - 2,
                 y_offset - 2,
                 line_width + 4,
                 line_height + 2
             )
             painter.fillRect(bg_rect, bg_color)
 
-            # Desenhar texto
-            text_rect = QRect(
-                0,
-                y_offset,
-                self.width(),
-                line_height
-            )
-            painter.drawText(
-                text_rect,
-                Qt.AlignmentFlag.AlignCenter,
-                line
-            )
+            # Desenhar texto (layout já preparado)
+            painter.drawStaticText(line_x, y_offset, static)
 
             y_offset += line_height
 
+    @property
+    def visible(self) -> bool:
+        """Se o balão ainda aparece (False no fim do fade)."""
+        return self._text_color.alpha() >= self.MIN_VISIBLE_ALPHA
+
+    def set_alpha(self, text_alpha: int, bg_alpha: int) -> bool:
+        """
+        Ajusta o alpha das cores já criadas (usado pelo fade).
+
+        Returns:
+            True se algum alpha mudou (precisa redesenhar)
+        """
+        if text_alpha == self._text_color.alpha() and bg_alpha == self._bg_color.alpha():
+            return False
+        self._text_color.setAlpha(text_alpha)
+        self._bg_color.setAlpha(bg_alpha)
+        return True
+
     def start_fade_out(self):
-        """Inicia animação de fade out (após 10s)."""
-        try:
-            self.fade_animation = QPropertyAnimation(self, b"opacity")
-            self.fade_animation.setDuration(300)
-            self.fade_animation.setStartValue(1.0)
-            self.fade_animation.setEndValue(0.0)
-            self.fade_animation.setEasingCurve(QEasingCurve.Type.InOutQuad)
-            self.fade_animation.finished.connect(self.deleteLater)
-            self.fade_animation.start()
-        except Exception as e:
-            logger.error(f"Erro ao fade: {e}")
+        """Inicia o fade out (no fim do prazo), conduzido pelo overlay."""
+        owner = self.parent()
+        if owner is None:
             self.deleteLater()
+            return
+        self.fade_started = time.monotonic()
+        owner.start_fade(self)
 
-    @pyqtProperty(float)
-    def opacity(self):
-        """Property para animação."""
-        return self._opacity
+    def remove(self):
+        """Tira o balão do overlay (que o guarda para reuso)."""
+        owner = self.parent()
+        if owner is None:
+            self.deleteLater()
+            return
+        owner.discard_replacement(self)
 
-    @opacity.setter
-    def opacity(self, value: float):
-        """Setter para animação."""
-        self._opacity = max(0.0, min(1.0, value))
-        self.update()
 
-    def mousePressEvent(self, event):
-        """Ao clicar, remove imediatamente."""
-        if event.button() == Qt.MouseButton.LeftButton:
-            self.hide_timer.stop()
-            self.deleteLater()
+def _cluster_roots(boxes: np.ndarray) -> np.ndarray:
+    """
+    Raiz (menor índice) do grupo de cada bbox, com bboxes ordenados por Y.
+    """
+    x, y, w, h = boxes.T
+    n = len(boxes)
+
+    # Com Y ordenado, os candidatos de i (gap vertical < 35) são uma
+    # faixa contígua i+1 .. end-1: só esses pares são avaliados
+    ends = np.searchsorted(y, y + h + 35, side='left')
+    counts = np.maximum(ends - np.arange(n) - 1, 0)
+    ii = np.repeat(np.arange(n), counts)
+    starts = np.repeat(np.cumsum(counts) - counts, counts)
+    jj = ii + 1 + (np.arange(len(ii)) - starts)
+
+    # Critérios para pertencer ao mesmo balão, por par (i, j)
+    x_aligned = np.abs(x[ii] - x[jj]) < 25
+    x_overlap = ~(x[ii] + w[ii] < x[jj]) & ~(x[jj] + w[jj] < x[ii])
+    close = x_aligned | x_overlap
+
+    # Une os componentes conectados
+    parent = list(range(n))
+
+    def find(k: int) -> int:
+        while parent[k] != k:
+            parent[k] = parent[parent[k]]
+            k = parent[k]
+        return k
+
+    for i, j in zip(ii[close].tolist(), jj[close].tolist()):
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+
+    return np.array([find(k) for k in range(n)], dtype=np.int32)
+
+
+def _cluster_core(boxes: np.ndarray) -> np.ndarray:
+    """Mesmo resultado de _cluster_roots, em laços simples (para o Numba)."""
+    n = boxes.shape[0]
+    parent = np.arange(n).astype(np.int32)
+
+    for i in range(n):
+        xi, yi, wi, hi = boxes[i, 0], boxes[i, 1], boxes[i, 2], boxes[i, 3]
+        limit = yi + hi + 35
+        for j in range(i + 1, n):
+            if boxes[j, 1] >= limit:
+                break
+            xj, wj = boxes[j, 0], boxes[j, 2]
+            if abs(xi - xj) < 25 or not (xi + wi < xj or xj + wj < xi):
+                ri = i
+                while parent[ri] != ri:
+                    ri = parent[ri]
+                rj = j
+                while parent[rj] != rj:
+                    rj = parent[rj]
+                if ri < rj:
+                    parent[rj] = ri
+                elif rj < ri:
+                    parent[ri] = rj
+
+    for k in range(n):
+        root = k
+        while parent[root] != root:
+            root = parent[root]
+        parent[k] = root
+
+    return parent
+
+
+if NUMBA_AVAILABLE:
+    _cluster_core = njit(cache=True)(_cluster_core)
+
+# Versão compilada pronta para uso. A primeira compilação leva segundos:
+# roda em uma thread à parte e, até terminar, o clustering usa _cluster_roots
+# (mesmo resultado), sem travar a GUI no primeiro lote
+_cluster_jit_ready = threading.Event()
+_cluster_warmup_started = False
+
+
+def _warm_up_cluster_core():
+    """Compila _cluster_core (ou carrega do cache em disco) fora da GUI."""
+    try:
+        _cluster_core(np.zeros((2, 4), dtype=np.int32))
+        _cluster_jit_ready.set()
+    except Exception as e:
+        logger.warning(f"Numba indisponível para o clustering, usando NumPy: {e}")
+
+
+def _start_cluster_warmup():
+    """Dispara a compilação em segundo plano (uma vez por processo)."""
+    global _cluster_warmup_started
+    if NUMBA_AVAILABLE and not _cluster_warmup_started:
+        _cluster_warmup_started = True
+        threading.Thread(
+            target=_warm_up_cluster_core, name="cluster-jit", daemon=True
+        ).start()
 
 
 class TranslationReplacer(QWidget):
@@ -238,14 +566,36 @@ class TranslationReplacer(QWidget):
         super().__init__()
 
         self.screen_area = screen_area
-        self.active_replacements: List[BalloonTextReplacement] = []
+        # Balões ativos, na ordem de criação (dict como conjunto ordenado:
+        # remoção O(1) e ordem de pintura estável)
+        self.active_replacements: Dict[BalloonTextReplacement, None] = {}
+
+        # Balões fora de uso, prontos para reset()
+        self._pool: List[BalloonTextReplacement] = []
 
-        # Buffer para agrupar resultados
-        self.pending_results: List[Dict] = []
+        # Buffer para agrupar resultados (limitado: uma rajada anormal
+        # descarta os mais antigos em vez de crescer sem fim)
+        self.pending_results: "deque[Dict]" = deque(maxlen=PENDING_LIMIT)
         self.buffer_timer = QTimer()
         self.buffer_timer.timeout.connect(self._process_buffer)
         self.buffer_timer.setSingleShot(True)
 
+        # Um único timer anima o fade de todos os balões
+        self._fading: set = set()
+        self._fade_timer = QTimer()
+        self._fade_timer.setInterval(FADE_INTERVAL_MS)
+        self._fade_timer.timeout.connect(self._fade_step)
+
+        # Expiração: todos os balões vivem o mesmo tempo, então a ordem de
+        # criação já é a ordem de expiração (fila simples, sem um timer por
+        # balão); o timer é armado para o primeiro prazo da fila. Cada
+        # entrada guarda o prazo junto: um balão reaproveitado tem prazo
+        # novo, e a entrada antiga fica reconhecível como obsoleta
+        self._expiry: "deque[Tuple[float, BalloonTextReplacement]]" = deque()
+        self._expiry_timer = QTimer()
+        self._expiry_timer.setSingleShot(True)
+        self._expiry_timer.timeout.connect(self._expire_replacements)
+
         # Setup window
         self.setWindowFlags(
             Qt.WindowType.FramelessWindowHint |
@@ -259,6 +609,9 @@ class TranslationReplacer(QWidget):
         x, y, w, h = screen_area
         self.setGeometry(x, y, w, h)
 
+        # Clustering compilado (Numba) já preparado antes do primeiro lote
+        _start_cluster_warmup()
+
         logger.info(
             f"✅ TranslationReplacer inicializado (modo TEXTO COM FUNDO) - "
             f"Área: {screen_area}"
@@ -275,17 +628,17 @@ class TranslationReplacer(QWidget):
                 logger.debug(f"⚠️ Resultado incompleto")
                 return
 
-            # Converter bbox para absoluto
-            abs_bbox = self._convert_bbox_to_absolute(bbox)
-            if not abs_bbox:
+            if len(bbox) != 4:
                 return
 
-            # Adicionar ao buffer
+            # Adicionar ao buffer (bbox ainda relativo; a conversão para
+            # absoluto é feita de uma vez em _process_buffer)
             buffered = {
                 'original': original,
                 'translated': translated,
-                'bbox': abs_bbox,
-                'timestamp': datetime.now()
+                'bbox': bbox,
+                'fitted': result.get('fitted'),
+                'timestamp': time.monotonic()
             }
             self.pending_results.append(buffered)
 
@@ -307,18 +660,42 @@ class TranslationReplacer(QWidget):
             f"🔄 Processando {len(self.pending_results)} resultado(s)"
         )
 
+        results = list(self.pending_results)
+        self.pending_results.clear()
+        results, boxes = self._absolute_bboxes(results)
+        if not results:
+            return
+
+        # OCR costuma repetir a mesma região enquanto estabiliza: descarta
+        # repetições do mesmo texto no mesmo lugar (grade de 8 px)
+        seen = set()
+        keep = []
+        for k, (result, cell) in enumerate(zip(results, (boxes >> 3).tolist())):
+            key = (result['original'], *cell)
+            if key not in seen:
+                seen.add(key)
+                keep.append(k)
+        if len(keep) < len(results):
+            logger.debug(f"♻️ {len(results) - len(keep)} resultado(s) repetido(s) descartado(s)")
+            results = [results[k] for k in keep]
+            boxes = boxes[keep]
+
+        for result, bbox in zip(results, boxes.tolist()):
+            result['bbox'] = tuple(bbox)
+
         # Agrupar por proximidade
-        groups = self._smart_clustering(self.pending_results)
+        groups = self._smart_clustering(results, boxes)
         logger.info(f"📦 {len(groups)} balão(ões) detectado(s)")
 
         # Criar substituição para cada grupo
         for i, group in enumerate(groups):
             self._create_grouped_replacement(group, i + 1)
 
-        # Limpar buffer
-        self.pending_results.clear()
-
-    def _smart_clustering(self, results: List[Dict]) -> List[List[Dict]]:
+    def _smart_clustering(
+        self,
+        results: List[Dict],
+        boxes: Optional[np.ndarray] = None
+    ) -> List[List[Dict]]:
         """Clustering inteligente por alinhamento e proximidade."""
         
         if not results:
@@ -327,51 +704,19 @@ class TranslationReplacer(QWidget):
             return [results]
 
         # Ordenar por Y (cima para baixo)
-        sorted_results = sorted(results, key=lambda r: r['bbox'][1])
-        groups = []
-        visited = set()
-
-        for i, result in enumerate(sorted_results):
-            if i in visited:
-                continue
-
-            current_group = [result]
-            visited.add(i)
-
-            bbox1 = result['bbox']
-            x1, y1, w1, h1 = bbox1
-
-            # Procurar próximos textos do mesmo balão
-            for j in range(i + 1, len(sorted_results)):
-                if j in visited:
-                    continue
+        if boxes is None:
+            boxes = np.asarray([r['bbox'] for r in results], dtype=np.int32)
+        order = np.argsort(boxes[:, 1], kind='stable')
+        boxes = boxes[order]
+        sorted_results = [results[k] for k in order]
+        roots = _cluster_core(boxes) if _cluster_jit_ready.is_set() else _cluster_roots(boxes)
 
-                candidate = sorted_results[j]
-                bbox2 = candidate['bbox']
-                x2, y2, w2, h2 = bbox2
+        # Grupos na ordem do primeiro texto (de cima para baixo)
+        groups: Dict[int, List[Dict]] = {}
+        for root, result in zip(roots.tolist(), sorted_results):
+            groups.setdefault(root, []).append(result)
 
-                # Critérios para pertencer ao mesmo balão
-                x_aligned = abs(x1 - x2) < 25
-                x_overlap = not (x1 + w1 < x2 or x2 + w2 < x1)
-
-                y_last = current_group[-1]['bbox'][1]
-                h_last = current_group[-1]['bbox'][3]
-                vertical_gap = y2 - (y_last + h_last)
-
-                close_vertically = vertical_gap < 35
-                too_far_down = vertical_gap > 70
-
-                should_group = (x_aligned or x_overlap) and close_vertically and not too_far_down
-
-                if should_group:
-                    current_group.append(candidate)
-                    visited.add(j)
-                elif too_far_down:
-                    break
-
-            groups.append(current_group)
-
-        return groups
+        return list(groups.values())
 
     def _create_grouped_replacement(self, group: List[Dict], balloon_num: int):
         """Cria substituição para um grupo de textos."""
@@ -395,18 +740,25 @@ class TranslationReplacer(QWidget):
 
         final_bbox = (x_min, y_min, x_max - x_min, y_max - y_min)
 
-        # Criar substituição
-        replacement = BalloonTextReplacement(
-            bbox=final_bbox,
-            translated_text=combined_translated,
-            original_text=combined_original
-        )
-
-        self.active_replacements.append(replacement)
-        replacement.show()
+        # Criar substituição (balão de um só resultado: ajuste já veio do worker)
+        fitted = group[0].get('fitted') if len(group) == 1 else None
+        if self._pool:
+            replacement = self._pool.pop()
+            replacement.reset(final_bbox, combined_translated, combined_original, fitted)
+        else:
+            replacement = BalloonTextReplacement(
+                bbox=final_bbox,
+                translated_text=combined_translated,
+                original_text=combined_original,
+                parent=self,
+                fitted=fitted
+            )
 
-        # Cleanup
-        self._cleanup_old_replacements()
+        self.active_replacements[replacement] = None
+        self._expiry.append((replacement.expires_at, replacement))
+        if not self._expiry_timer.isActive():
+            self._schedule_expiry()
+        self.update(replacement.rect)
 
         # Log
         trans_preview = combined_translated.replace('\n', ' | ')[:50]
@@ -415,52 +767,151 @@ class TranslationReplacer(QWidget):
             f"({len(group)} linha(s)) - TEXTO RENDERIZADO"
         )
 
-    def _convert_bbox_to_absolute(self, bbox: Tuple) -> Optional[Tuple[int, int, int, int]]:
-        """Converte bbox relativo para absoluto."""
-        try:
-            if not bbox or len(bbox) != 4:
-                return None
-
-            rel_x, rel_y, rel_w, rel_h = float(bbox[0]), float(bbox[1]), float(bbox[2]), float(bbox[3])
-            area_x, area_y, area_w, area_h = self.screen_area
+    def _absolute_bboxes(self, results: List[Dict]) -> Tuple[List[Dict], np.ndarray]:
+        """
+        Converte os bboxes relativos dos resultados para absolutos.
 
-            abs_x = int(area_x + rel_x)
-            abs_y = int(area_y + rel_y)
-            abs_w = int(max(rel_w, 40))
-            abs_h = int(max(rel_h, 20))
+        Resultados com bbox inválido são descartados um a um (os demais
+        do buffer seguem). Retorna (resultados válidos, bboxes (N, 4) int32).
+        """
+        valid: List[Dict] = []
+        rows: List[List[float]] = []
+        for result in results:
+            try:
+                row = [float(v) for v in result['bbox']]
+            except (TypeError, ValueError) as e:
+                logger.error(f"❌ Erro ao converter bbox {result.get('bbox')!r}: {e}")
+                continue
+            if len(row) != 4:
+                logger.error(f"❌ Bbox inválido: {result.get('bbox')!r}")
+                continue
+            valid.append(result)
+            rows.append(row)
 
-            return (abs_x, abs_y, abs_w, abs_h)
+        rel = np.asarray(rows, dtype=np.float64).reshape(-1, 4)
+        finite = np.isfinite(rel).all(axis=1)
+        if not finite.all():
+            logger.error(f"❌ {int((~finite).sum())} bbox(es) com valor não finito descartado(s)")
+            valid = [r for r, ok in zip(valid, finite.tolist()) if ok]
+            rel = rel[finite]
 
-        except Exception as e:
-            logger.error(f"❌ Erro ao converter bbox: {e}")
-            return None
+        area_x, area_y = self.screen_area[0], self.screen_area[1]
+        absolute = rel + (area_x, area_y, 0, 0)
+        np.maximum(absolute[:, 2], 40, out=absolute[:, 2])
+        np.maximum(absolute[:, 3], 20, out=absolute[:, 3])
 
-    def _cleanup_old_replacements(self):
-        """Remove substituições antigas/deletadas."""
-        cleaned = []
-        for repl in self.active_replacements:
-            try:
-                if not repl.isHidden() and repl.isVisible():
-                    cleaned.append(repl)
-            except RuntimeError:
-                pass
-        self.active_replacements = cleaned
+        # astype trunca em direção a zero, como int()
+        return valid, absolute.astype(np.int32)
 
     def clear_all(self):
         """Remove todas as substituições."""
         self.buffer_timer.stop()
         self.pending_results.clear()
+        self._fade_timer.stop()
+        self._fading.clear()
+        self._expiry_timer.stop()
+        self._expiry.clear()
 
         for repl in self.active_replacements:
-            try:
-                repl.hide()
-                repl.deleteLater()
-            except RuntimeError:
-                pass
+            self._release(repl)
 
         self.active_replacements.clear()
+        self.update()
         logger.info("🗑️ Todas as substituições removidas")
 
+    def _schedule_expiry(self):
+        """Arma o timer para o prazo do balão mais antigo."""
+        if self._expiry:
+            delay = self._expiry[0][0] - time.monotonic()
+            self._expiry_timer.start(max(0, int(delay * 1000)))
+
+    def _expire_replacements(self):
+        """Inicia o fade dos balões cujo prazo venceu."""
+        now = time.monotonic()
+        expiry = self._expiry
+        while expiry and expiry[0][0] <= now:
+            expires_at, repl = expiry.popleft()
+            # Já removido (clique), reaproveitado ou já em fade: nada a fazer
+            if (repl.expires_at == expires_at and repl in self.active_replacements
+                    and repl not in self._fading):
+                repl.start_fade_out()
+        self._schedule_expiry()
+
+    def start_fade(self, replacement: BalloonTextReplacement):
+        """Inclui o balão no fade compartilhado."""
+        self._fading.add(replacement)
+        if not self._fade_timer.isActive():
+            self._fade_timer.start()
+
+    def _fade_step(self):
+        """Atualiza o alpha de todos os balões em fade."""
+        now = time.monotonic()
+        finished = []
+        dirty = QRegion()
+        for repl in self._fading:
+            t = (now - repl.fade_started) * 1000 / FADE_DURATION_MS
+            if t >= 1.0:
+                finished.append(repl)
+                continue
+            # Easing suave (smoothstep): alphas vão do inicial até 0
+            level = 1.0 - t * t * (3.0 - 2.0 * t)
+            was_visible = repl.visible
+            changed = repl.set_alpha(
+                int(BalloonTextReplacement.TEXT_ALPHA * level),
+                int(BalloonTextReplacement.BG_ALPHA * level)
+            )
+            # Só invalida se o alpha mudou e o balão aparecia (o quadro em
+            # que ele some ainda precisa apagar a área)
+            if changed and was_visible:
+                dirty = dirty.united(repl.rect)
+
+        # Uma só atualização com a união das áreas em fade
+        if not dirty.isEmpty():
+            self.update(dirty)
+
+        for repl in finished:
+            repl.remove()
+
+        if not self._fading:
+            self._fade_timer.stop()
+
+    def discard_replacement(self, replacement: BalloonTextReplacement):
+        """Remove um balão da lista e apaga sua área."""
+        self._fading.discard(replacement)
+        if replacement in self.active_replacements:
+            del self.active_replacements[replacement]
+            self.update(replacement.rect)
+            self._release(replacement)
+
+    def _release(self, replacement: BalloonTextReplacement):
+        """Devolve o balão ao pool (ou o destrói se o pool está cheio)."""
+        if len(self._pool) < BALLOON_POOL_SIZE:
+            self._pool.append(replacement)
+        else:
+            replacement.deleteLater()
+
     def paintEvent(self, event):
-        """Overlay invisível."""
-        pass
\ No newline at end of file
+        """Desenha todos os balões ativos em uma única passada."""
+        if not self.active_replacements:
+            return
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+
+        # Só os balões dentro da área suja (o resto continua como está)
+        region = event.region()
+        for repl in self.active_replacements:
+            if repl.visible and region.intersects(repl.rect):
+                repl.paint(painter)
+
+    def mousePressEvent(self, event):
+        """Ao clicar em um balão, remove imediatamente (o de cima)."""
+        if event.button() != Qt.MouseButton.LeftButton:
+            return
+
+        pos = event.position().toPoint()
+        for repl in reversed(list(self.active_replacements)):
+            if repl.rect.contains(pos):
+                repl.remove()
+                break
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""
+Rotinas numéricas do OCR compiladas com Numba (quando instalado).
+
+Importado só depois do PaddleOCR carregar: o import do Numba custa
+algumas centenas de ms e não deve pesar na abertura da aplicação.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+# Constantes do FNV-1a de 64 bits
+_FNV_OFFSET = np.uint64(14695981039346656037)
+_FNV_PRIME = np.uint64(1099511628211)
+
+
+def image_signature(data: np.ndarray, height: int, width: int, channels: int) -> int:
+    """
+    Hash de 64 bits (FNV-1a por palavra de 8 bytes) do buffer inteiro do
+    frame e do seu formato. Todos os bytes entram na chave.
+
+    Args:
+        data: Buffer uint8 contíguo e achatado do frame
+        height: Altura da imagem
+        width: Largura da imagem
+        channels: Número de canais
+    """
+    h = _FNV_OFFSET
+    for value in (height, width, channels):
+        h ^= np.uint64(value)
+        h *= _FNV_PRIME
+
+    n_words = data.size // 8
+    words = data[:n_words * 8].view(np.uint64)
+    for i in range(n_words):
+        h ^= words[i]
+        h *= _FNV_PRIME
+        h ^= h >> np.uint64(32)
+
+    for i in range(n_words * 8, data.size):
+        h ^= np.uint64(data[i])
+        h *= _FNV_PRIME
+    return h
+
+
+if NUMBA_AVAILABLE:
+    # cache=True grava o código compilado em disco: da segunda execução
+    # em diante não há compilação
+    image_signature = njit(cache=True)(image_signature)
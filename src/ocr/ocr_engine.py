@@ -4,8 +4,10 @@ Engine OCR com PaddleOCR.
 
 from typing import List, Optional, Tuple
 from datetime import datetime
+from collections import OrderedDict
 import numpy as np
 import hashlib
+import threading
 from loguru import logger
 
 try:
@@ -15,8 +17,17 @@ except ImportError:
     PADDLEOCR_AVAILABLE = False
     logger.warning("PaddleOCR não disponível")
 
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
 from src.utils.types import OCRResult
 
+# Máximo de frames no cache de OCR
+CACHE_SIZE = 100
+
 
 class OCREngine:
     """Engine de OCR usando PaddleOCR."""
@@ -32,7 +43,10 @@ class OCREngine:
 
         self.languages = languages or ['en', 'ko']
         self.use_gpu = use_gpu
-        self.cache = {}  # Cache simples em memória
+        self.cache: "OrderedDict[int, List[OCRResult]]" = OrderedDict()  # LRU em memória
+        # Engine compartilhado pelos consumers: consulta/reordenação e
+        # inserção/despejo do LRU precisam ser atômicas
+        self._cache_lock = threading.Lock()
         
         # Mapear códigos de idioma
         lang_map = {'en': 'en', 'ko': 'korean'}
@@ -50,6 +64,10 @@ class OCREngine:
             logger.error(f"Erro ao inicializar PaddleOCR: {e}")
             raise
 
+        # Hash compilado (Numba), importado só agora para não atrasar o início
+        from src.ocr import _fast
+        self._signature = _fast.image_signature if _fast.NUMBA_AVAILABLE else None
+
     def extract_text(self, image: np.ndarray) -> List[OCRResult]:
         """
         Extrai texto de uma imagem.
@@ -62,9 +80,13 @@ class OCREngine:
         """
         # Cache baseado em hash da imagem
         img_hash = self._hash_image(image)
-        if img_hash in self.cache:
+        with self._cache_lock:
+            cached = self.cache.get(img_hash)
+            if cached is not None:
+                self.cache.move_to_end(img_hash)
+        if cached is not None:
             logger.debug("Cache hit para OCR")
-            return self.cache[img_hash]
+            return cached
 
         try:
             results = []
@@ -74,27 +96,22 @@ class OCREngine:
                 logger.debug("Nenhum texto detectado")
                 return []
 
-            for line in ocr_results[0]:
-                bbox = line[0]  # [[x1,y1], [x2,y2], [x3,y3], [x4,y4]]
-                text_info = line[1]  # (text, confidence)
-                
-                text = text_info[0]
-                confidence = text_info[1]
-
-                # Converter bbox para formato simples (x1, y1, x2, y2)
-                x_coords = [point[0] for point in bbox]
-                y_coords = [point[1] for point in bbox]
-                simple_bbox = (
-                    min(x_coords),
-                    min(y_coords),
-                    max(x_coords),
-                    max(y_coords)
-                )
+            lines = ocr_results[0]
+
+            # Converter todos os bboxes ([[x1,y1], ..., [x4,y4]] por linha)
+            # para formato simples (x1, y1, x2, y2) de uma vez: (N, 4, 2)
+            polygons = np.asarray([line[0] for line in lines], dtype=np.float64)
+            simple_bboxes = np.concatenate(
+                (polygons.min(axis=1), polygons.max(axis=1)), axis=1
+            ).tolist()
+
+            for line, simple_bbox in zip(lines, simple_bboxes):
+                text, confidence = line[1][0], line[1][1]  # (texto, confiança)
 
                 result = OCRResult(
                     text=text,
                     confidence=confidence,
-                    bbox=simple_bbox,
+                    bbox=tuple(simple_bbox),
                     language=self.languages[0],
                     timestamp=datetime.now()
                 )
@@ -102,9 +119,11 @@ class OCREngine:
                 if result.is_valid():
                     results.append(result)
 
-            # Armazenar no cache
-            if len(self.cache) < 100:  # Limite de cache
+            # Armazenar no cache (descarta o usado há mais tempo)
+            with self._cache_lock:
                 self.cache[img_hash] = results
+                if len(self.cache) > CACHE_SIZE:
+                    self.cache.popitem(last=False)
 
             logger.debug(f"OCR extraiu {len(results)} textos")
             return results
@@ -113,11 +132,31 @@ class OCREngine:
             logger.error(f"Erro no OCR: {e}")
             return []
 
-    def _hash_image(self, image: np.ndarray) -> str:
-        """Gera hash SHA256 de uma imagem."""
-        return hashlib.sha256(image.tobytes()).hexdigest()[:16]
+    def _hash_image(self, image: np.ndarray) -> int:
+        """
+        Gera hash do buffer inteiro da imagem (todos os pixels e o formato):
+        uma mudança pequena no texto sempre muda a chave do cache.
+
+        Usa xxh3 (não criptográfico) se o xxhash estiver instalado; senão a
+        rotina compilada com Numba ou blake2b de 8 bytes. A chave é um int
+        (lookup mais barato que str).
+        """
+        data = np.ascontiguousarray(image)
+
+        if XXHASH_AVAILABLE:
+            digest = xxhash.xxh3_64(repr(image.shape).encode())
+            digest.update(data.data)
+            return digest.intdigest()
+
+        if self._signature is not None and data.ndim == 3 and data.dtype == np.uint8:
+            return int(self._signature(data.reshape(-1), *data.shape))
+
+        digest = hashlib.blake2b(repr(image.shape).encode(), digest_size=8)
+        digest.update(data.data)
+        return int.from_bytes(digest.digest(), 'little')
 
     def clear_cache(self):
         """Limpa o cache de OCR."""
-        self.cache.clear()
+        with self._cache_lock:
+            self.cache.clear()
         logger.debug("Cache de OCR limpo")
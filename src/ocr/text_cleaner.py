@@ -4,8 +4,44 @@ Limpeza e normalização de texto de OCR.
 
 import re
 import unicodedata
+from functools import lru_cache
 from typing import List
 
+import numpy as np
+
+
+class _ControlCharTable(dict):
+    """
+    Tabela para str.translate que remove caracteres de controle (categoria
+    C*). Preenchida sob demanda: cada code point é classificado uma vez.
+    """
+
+    def __missing__(self, code: int):
+        value = None if unicodedata.category(chr(code))[0] == 'C' else code
+        self[code] = value
+        return value
+
+
+_CONTROL_CHARS = _ControlCharTable()
+
+# Sequências de espaço em branco (normalizadas para um espaço)
+_WHITESPACE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=8)
+def _paragraph_pattern(max_words: int) -> "re.Pattern[str]":
+    """Regex que casa até max_words palavras seguidas (texto normalizado)."""
+    return re.compile(r'(?:\S+ ?){1,%d}' % max_words)
+
+
+@lru_cache(maxsize=8)
+def _significant_pattern(min_length: int) -> "re.Pattern[str]":
+    """
+    Regex que casa palavras (trechos sem espaço) com pelo menos min_length
+    caracteres e ao menos um alfanumérico ([^\W_] = str.isalnum).
+    """
+    return re.compile(r'(?<!\S)(?=\S{%d})(?=\S*[^\W_])\S+' % max(min_length, 1))
+
 
 class TextCleaner:
     """Limpa e normaliza texto extraído por OCR."""
@@ -30,7 +66,7 @@ class TextCleaner:
         text = ' '.join(text.split())
 
         # Remover caracteres de controle
-        text = ''.join(char for char in text if unicodedata.category(char)[0] != 'C')
+        text = text.translate(_CONTROL_CHARS)
 
         # Normalizar unicode se habilitado
         if self.normalize_unicode:
@@ -49,14 +85,13 @@ class TextCleaner:
         Returns:
             Lista de parágrafos
         """
-        words = text.split()
-        paragraphs = []
-        
-        for i in range(0, len(words), max_words):
-            paragraph = ' '.join(words[i:i + max_words])
-            paragraphs.append(paragraph)
-        
-        return paragraphs
+        # Cada parágrafo é um trecho do texto normalizado, casado pela regex
+        # (sem criar uma string por palavra)
+        normalized = _WHITESPACE.sub(' ', text).strip()
+        return [
+            match.group().rstrip(' ')
+            for match in _paragraph_pattern(max_words).finditer(normalized)
+        ]
 
     def extract_significant_text(self, text: str, min_length: int = 3) -> str:
         """
@@ -69,9 +104,7 @@ class TextCleaner:
         Returns:
             Texto filtrado
         """
-        words = text.split()
-        filtered = [w for w in words if len(w) >= min_length and any(c.isalnum() for c in w)]
-        return ' '.join(filtered)
+        return ' '.join(_significant_pattern(min_length).findall(text))
 
     @staticmethod
     def estimate_language(text: str) -> str:
@@ -84,11 +117,15 @@ class TextCleaner:
         if not text:
             return 'unknown'
 
+        # Code points do texto (UTF-32: 4 bytes fixos por caractere)
+        codes = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+
         # Detectar caracteres coreanos (Hangul)
-        korean_chars = sum(1 for c in text if '\uac00' <= c <= '\ud7a3')
+        korean_chars = np.count_nonzero((codes >= 0xAC00) & (codes <= 0xD7A3))
         
-        # Detectar caracteres ASCII (inglês)
-        ascii_chars = sum(1 for c in text if 'a' <= c.lower() <= 'z')
+        # Detectar caracteres ASCII (inglês); | 0x20 leva A-Z para a-z
+        lower = codes | 0x20
+        ascii_chars = np.count_nonzero((lower >= 0x61) & (lower <= 0x7A))
 
         total = len(text)
         if total == 0:
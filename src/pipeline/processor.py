@@ -2,12 +2,17 @@
 Pipeline de processamento com workers paralelos.
 """
 
+import multiprocessing
 import queue
 import threading
 import time
+from collections import deque
+from functools import lru_cache
+from itertools import compress
+from operator import attrgetter
 from typing import Callable, List, Dict, Any
-from datetime import datetime
 
+import numpy as np
 from loguru import logger
 
 from src.utils.types import ScreenArea, ProcessingTask, OCRResult
@@ -22,6 +27,83 @@ from src.utils.language_detector import LanguageDetector
 from src.utils.text_grouper import TextGrouper
 
 
+# Textos distintos lembrados pelos caches de limpeza/detecção de idioma
+TEXT_CACHE_SIZE = 4096
+
+# (texto, confiança, bbox) de um OCRResult em uma chamada
+_text_conf_bbox = attrgetter("text", "confidence", "bbox")
+
+# Intervalo (s) em que um consumer esperando o pool de OCR confere se a
+# pipeline foi parada
+POOL_POLL_INTERVAL = 0.5
+
+# Estado de cada processo do pool de OCR: um OCREngine persistente por
+# processo (criado uma vez no initializer, não a cada frame)
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_ocr_process(languages: List[str], use_gpu: bool, gpu_lock):
+    """Initializer do pool: cria o OCREngine deste processo."""
+    _worker_state["gpu_lock"] = gpu_lock
+    try:
+        _worker_state["engine"] = OCREngine(languages=languages, use_gpu=use_gpu)
+    except Exception as e:
+        # Sem levantar: o pool recriaria o processo em loop
+        _worker_state["engine"] = None
+        _worker_state["error"] = str(e)
+
+
+def _ocr_in_process(frame) -> List[OCRResult]:
+    """Roda o OCR no processo do pool (com a GPU em uso exclusivo, se houver)."""
+    engine = _worker_state.get("engine")
+    if engine is None:
+        raise RuntimeError(
+            f"OCR indisponível no processo: {_worker_state.get('error', '?')}"
+        )
+
+    gpu_lock = _worker_state.get("gpu_lock")
+    if gpu_lock is None:
+        return engine.extract_text(frame)
+    with gpu_lock:
+        return engine.extract_text(frame)
+
+
+class LatestFrameQueue:
+    """
+    Fila limitada de frames em que o mais novo vence: cheia, descarta o
+    mais antigo ao enfileirar, e get() entrega o mais recente descartando
+    os anteriores (já obsoletos).
+    """
+
+    def __init__(self, maxlen: int):
+        self._items: "deque[ProcessingTask]" = deque(maxlen=maxlen)
+        self._cond = threading.Condition()
+        self.dropped = 0  # frames descartados sem passar pelo OCR
+
+    def put(self, task: ProcessingTask):
+        """Enfileira o frame (descartando o mais antigo se cheia)."""
+        with self._cond:
+            if len(self._items) == self._items.maxlen:
+                self.dropped += 1
+            self._items.append(task)
+            self._cond.notify()
+
+    def get(self, timeout: float = None) -> ProcessingTask:
+        """Retira o frame mais recente; queue.Empty se o timeout vencer."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items, timeout):
+                raise queue.Empty
+            task = self._items.pop()
+            # Os que sobraram são mais velhos que o entregue: nunca devem
+            # ser processados depois dele
+            self.dropped += len(self._items)
+            self._items.clear()
+            return task
+
+    def qsize(self) -> int:
+        return len(self._items)
+
+
 class ProcessingPipeline:
     """Pipeline de processamento com Producer-Consumer."""
 
@@ -47,15 +129,31 @@ class ProcessingPipeline:
             threshold=settings_manager.get("capture.detection_threshold", 0.08)
         )
 
-        # OCR
-        ocr_langs = settings_manager.get("ocr.languages", ["en", "ko"])
-        use_gpu = settings_manager.get("ocr.use_gpu", False)
-        self.ocr_engine = OCREngine(languages=ocr_langs, use_gpu=use_gpu)
+        # OCR: na própria thread do worker ou, com ocr.use_processes, em
+        # um pool de processos (criado em start) com um OCREngine cada
+        self.ocr_langs = settings_manager.get("ocr.languages", ["en", "ko"])
+        self.ocr_use_gpu = settings_manager.get("ocr.use_gpu", False)
+        self.ocr_processes = settings_manager.get("ocr.use_processes", False)
+        self.ocr_pool = None
+        self.ocr_engine = (
+            None
+            if self.ocr_processes
+            else OCREngine(languages=self.ocr_langs, use_gpu=self.ocr_use_gpu)
+        )
         self.text_cleaner = TextCleaner()
 
         # Detector de idioma (Fase 2)
         self.language_detector = LanguageDetector()
 
+        # Limpeza e detecção só dependem do texto, que se repete de um frame
+        # para o outro (legendas/falas paradas na tela): memoizadas
+        self._clean_cached = lru_cache(maxsize=TEXT_CACHE_SIZE)(
+            self.text_cleaner.clean
+        )
+        self._detect_cached = lru_cache(maxsize=TEXT_CACHE_SIZE)(
+            self.language_detector.detect
+        )
+
         # Agrupamento de textos próximos (Fase 5)
         group_distance = self.settings.get("translation.group_distance", 50)
         self.group_nearby = self.settings.get(
@@ -106,7 +204,10 @@ class ProcessingPipeline:
         self.cache_manager = CacheManager(cache_path, max_entries)
 
         # Controle
-        self.task_queue = queue.PriorityQueue()
+        # Só os frames mais novos (um por worker): sob carga, os velhos
+        # são descartados em vez de acumular na fila
+        self.task_queue = LatestFrameQueue(maxlen=num_ocr_workers)
+        self._dropped_frames = 0  # capturas puladas com os workers ocupados
         self.running = False
         self.threads: List[threading.Thread] = []
 
@@ -128,6 +229,17 @@ class ProcessingPipeline:
         self.running = True
         self.capture_area = area
 
+        # Pool de OCR (spawn: processos limpos, sem herdar threads/Qt)
+        if self.ocr_processes and self.ocr_pool is None:
+            context = multiprocessing.get_context("spawn")
+            gpu_lock = context.Semaphore(1) if self.ocr_use_gpu else None
+            self.ocr_pool = context.Pool(
+                self.num_workers,
+                initializer=_init_ocr_process,
+                initargs=(self.ocr_langs, self.ocr_use_gpu, gpu_lock),
+            )
+            logger.info(f"Pool de OCR iniciado - {self.num_workers} processos")
+
         # Thread producer (captura)
         producer_thread = threading.Thread(
             target=self._producer_loop, daemon=True
@@ -154,10 +266,19 @@ class ProcessingPipeline:
 
         self.running = False
 
-        # Aguardar threads
+        # Aguardar threads (consumers esperando o pool saem em até
+        # POOL_POLL_INTERVAL e param de enviar frames)
         for thread in self.threads:
             thread.join(timeout=2)
 
+        # Sem novos envios: fecha o pool e espera os processos terminarem o
+        # frame em andamento (terminate poderia deixar um consumer preso)
+        if self.ocr_pool is not None:
+            self.ocr_pool.close()
+            self.ocr_pool.join()
+            self.ocr_pool = None
+
+        self.translation_service.close()
         self.capturer.release()
         logger.info("Pipeline parada")
 
@@ -170,6 +291,13 @@ class ProcessingPipeline:
 
         while self.running:
             try:
+                # Workers ainda com a fila cheia: nem captura (o frame seria
+                # descartado mesmo) e espera mais antes de tentar de novo
+                if self.task_queue.qsize() >= self.num_workers:
+                    self._dropped_frames += 1
+                    time.sleep(2 * sleep_time)
+                    continue
+
                 # Capturar frame
                 frame = self.capturer.capture_area(self.capture_area)
                 if frame is None:
@@ -183,14 +311,16 @@ class ProcessingPipeline:
                     task = ProcessingTask(
                         frame=frame,
                         area=self.capture_area,
-                        timestamp=datetime.now(),
-                        priority=5,
+                        timestamp=time.monotonic_ns(),
                     )
                     self.task_queue.put(task)
                     logger.debug(
                         f"Frame enfileirado - diff: {diff_value:.4f}"
                     )
 
+                # Sem referências locais ao frame durante a espera: a fila
+                # (e o worker) decidem quando ele pode ser liberado
+                frame = task = None
                 time.sleep(sleep_time)
 
             except Exception as e:
@@ -218,13 +348,25 @@ class ProcessingPipeline:
                 if results and self.callback:
                     self.callback(results)
 
-                self.task_queue.task_done()
-
             except queue.Empty:
                 continue
             except Exception as e:
                 logger.error(f"Erro no worker {worker_id}: {e}")
 
+    def _extract_text(self, frame) -> List[OCRResult]:
+        """OCR do frame: no pool de processos (se ativo) ou nesta thread."""
+        pool = self.ocr_pool
+        if pool is not None:
+            pending = pool.apply_async(_ocr_in_process, (frame,))
+            # Espera em fatias para não prender o consumer se a pipeline parar
+            while self.running:
+                try:
+                    return pending.get(timeout=POOL_POLL_INTERVAL)
+                except multiprocessing.TimeoutError:
+                    continue
+            return []
+        return self.ocr_engine.extract_text(frame)
+
     def _process_frame(self, task: ProcessingTask) -> List[Dict[str, Any]]:
         """
         Processa um frame: OCR + Agrupamento + Tradução.
@@ -239,42 +381,44 @@ class ProcessingPipeline:
 
         try:
             # 1. OCR
-            ocr_results: List[OCRResult] = self.ocr_engine.extract_text(
-                task.frame
-            )
+            ocr_results: List[OCRResult] = self._extract_text(task.frame)
+            # O frame (vários MB) não é mais usado: libera já, em vez de
+            # segurá-lo durante limpeza/tradução/cache
+            task.frame = None
             if not ocr_results:
                 return results
 
+            # Atributos usados por detecção, resolvidos uma vez por frame
+            threshold = self.ocr_conf_threshold
+            clean = self._clean_cached
+            detect = self._detect_cached
+            get_cached_bulk = self.cache_manager.get_translations_bulk
+            save_cached_bulk = self.cache_manager.save_translations_bulk
+            translate_batch = self.translation_service.translate_batch
+
             # Fase 1 – filtro de confiança de OCR:
             # descarta resultados com confidence abaixo de self.ocr_conf_threshold
+            # (sem valor de confiança: mantém). Uma máscara para o frame todo.
             total_ocr = len(ocr_results)
-            filtered_ocr_results: List[OCRResult] = []
-
-            for ocr_result in ocr_results:
-                confidence = getattr(ocr_result, "confidence", None)
-
-                # Se houver valor de confiança e ele for menor que o limiar, descarta
-                if (
-                    confidence is not None
-                    and confidence < self.ocr_conf_threshold
-                ):
-                    text_preview = (ocr_result.text or "")[
-                        :30
-                    ].replace("\n", " ")
-                    logger.debug(
-                        "OCR descartado por baixa confiança "
-                        f"(conf={confidence:.3f} < limiar={self.ocr_conf_threshold:.3f}): "
-                        f"'{text_preview}'"
-                    )
-                    continue
-
-                filtered_ocr_results.append(ocr_result)
+            confidences = np.fromiter(
+                (
+                    np.inf if r.confidence is None else r.confidence
+                    for r in ocr_results
+                ),
+                dtype=np.float64,
+                count=total_ocr,
+            )
+            keep = confidences >= threshold
+            filtered_ocr_results: List[OCRResult] = list(
+                compress(ocr_results, keep.tolist())
+            )
 
             logger.debug(
                 "OCR: "
                 f"{total_ocr} detectados, "
                 f"{len(filtered_ocr_results)} acima do threshold "
-                f"{self.ocr_conf_threshold:.3f}"
+                f"{threshold:.3f} "
+                f"({total_ocr - len(filtered_ocr_results)} descartados por baixa confiança)"
             )
 
             if not filtered_ocr_results:
@@ -284,14 +428,16 @@ class ProcessingPipeline:
             # 2. Preparar entrada para agrupamento (texto limpo + idioma + bbox normalizado)
             grouped_input: List[Dict[str, Any]] = []
 
-            for ocr_result in filtered_ocr_results:
+            for text, confidence, bbox_xyxy in map(
+                _text_conf_bbox, filtered_ocr_results
+            ):
                 # Limpar texto
-                clean_text = self.text_cleaner.clean(ocr_result.text)
+                clean_text = clean(text)
                 if not clean_text or len(clean_text) < 2:
                     continue
 
                 # Detectar idioma com LanguageDetector (Fase 2)
-                detected_lang = self.language_detector.detect(clean_text)
+                detected_lang = detect(clean_text)
                 logger.debug(
                     f"Idioma detectado: {detected_lang} para "
                     f"'{clean_text[:30]}...'"
@@ -301,7 +447,6 @@ class ProcessingPipeline:
                 )
 
                 # Converter bbox para (x, y, w, h) para o TextGrouper
-                bbox_xyxy = ocr_result.bbox
                 if bbox_xyxy and len(bbox_xyxy) == 4:
                     x1, y1, x2, y2 = bbox_xyxy
                     bbox_wh = (x1, y1, x2 - x1, y2 - y1)
@@ -312,7 +457,7 @@ class ProcessingPipeline:
                     {
                         "original": clean_text,
                         "bbox": bbox_wh,
-                        "confidence": ocr_result.confidence,
+                        "confidence": confidence,
                         "language": source_lang,
                     }
                 )
@@ -332,7 +477,9 @@ class ProcessingPipeline:
             else:
                 grouped_results = grouped_input
 
-            # 4. Traduzir por grupo
+            # 4. Traduzir por grupo (idioma de cada grupo primeiro, para
+            # consultar o cache e traduzir as faltas em lote)
+            groups: List[tuple] = []
             for item in grouped_results:
                 combined_original = item.get("original", "")
                 if not combined_original or len(combined_original) < 2:
@@ -341,9 +488,7 @@ class ProcessingPipeline:
                 # Usar idioma já detectado para o grupo, ou recalcular se necessário
                 source_lang = item.get("language", "")
                 if not source_lang or source_lang == "unknown":
-                    detected_lang = self.language_detector.detect(
-                        combined_original
-                    )
+                    detected_lang = detect(combined_original)
                     logger.debug(
                         f"Idioma (re)detectado para grupo: {detected_lang} "
                         f"para '{combined_original[:30]}...'"
@@ -352,45 +497,57 @@ class ProcessingPipeline:
                         detected_lang if detected_lang != "unknown" else "en"
                     )
 
-                bbox = item.get("bbox")
-                confidence = item.get("confidence", 1.0)
+                groups.append((item, combined_original, source_lang))
+
+            if not groups:
+                return results
 
-                # 4.1 Tentar cache primeiro
-                cached = self.cache_manager.get_translation(
-                    combined_original,
-                    source_lang=source_lang,
+            # 4.1 Tentar cache primeiro (uma consulta para o frame)
+            keys = [(original, lang) for _, original, lang in groups]
+            cached = get_cached_bulk(keys, target_lang="pt")
+
+            # 4.2 Traduzir as faltas (sem repetir texto) usando serviço
+            # (Groq/Google/Ollama/Offline), em paralelo
+            misses = [key for key in dict.fromkeys(keys) if not cached.get(key)]
+            translated: Dict[tuple, Any] = {}
+            if misses:
+                translation_results = translate_batch(
+                    [original for original, _ in misses],
+                    [lang for _, lang in misses],
                     target_lang="pt",
                 )
+                translated = dict(zip(misses, translation_results))
+
+                # 4.3 Salvar no cache (uma transação)
+                save_cached_bulk(
+                    [
+                        {
+                            "original_text": original,
+                            "translated_text": tr.translated_text,
+                            "source_lang": lang,
+                            "target_lang": "pt",
+                            "provider": tr.provider.value,
+                            "confidence": tr.confidence,
+                        }
+                        for (original, lang), tr in translated.items()
+                    ]
+                )
 
-                if cached:
-                    translated_text = cached
+            # 5. Adicionar aos resultados (um por grupo)
+            for (item, combined_original, source_lang), key in zip(groups, keys):
+                if cached.get(key):
+                    translated_text = cached[key]
                     provider = "cache"
                 else:
-                    # 4.2 Traduzir usando serviço (Groq/Google/Ollama/Offline)
-                    translation_result = self.translation_service.translate(
-                        combined_original,
-                        source_lang=source_lang,
-                        target_lang="pt",
-                    )
+                    translation_result = translated[key]
                     translated_text = translation_result.translated_text
                     provider = translation_result.provider.value
 
-                    # 4.3 Salvar no cache
-                    self.cache_manager.save_translation(
-                        original_text=combined_original,
-                        translated_text=translated_text,
-                        source_lang=source_lang,
-                        target_lang="pt",
-                        provider=provider,
-                        confidence=translation_result.confidence,
-                    )
-
-                # 5. Adicionar aos resultados (um por grupo)
                 result = {
                     "original": combined_original,
                     "translated": translated_text,
-                    "bbox": bbox,
-                    "confidence": confidence,
+                    "bbox": item.get("bbox"),
+                    "confidence": item.get("confidence", 1.0),
                     "language": source_lang,
                     "provider": provider,
                 }
@@ -413,7 +570,14 @@ class ProcessingPipeline:
         stats = {
             "running": self.running,
             "queue_size": self.task_queue.qsize(),
+            "frames_dropped": self.task_queue.dropped,
+            "frames_skipped": self._dropped_frames,
+            "text_cache": {
+                "clean": self._clean_cached.cache_info()._asdict(),
+                "detect": self._detect_cached.cache_info()._asdict(),
+            },
             "num_workers": self.num_workers,
+            "ocr_processes": self.ocr_pool is not None,
             "cache": cache_stats,
             "translators": active_providers,
         }
@@ -7,7 +7,10 @@ Responsável por rodar o ProcessingPipeline em uma QThread, emitindo sinais:
 - error_occurred(str)
 """
 
-from datetime import datetime
+import heapq
+import threading
+import time
+from typing import Tuple
 
 from PyQt6.QtCore import QThread, pyqtSignal
 from loguru import logger
@@ -43,9 +46,16 @@ class PipelineWorker(QThread):
             max_distance=settings_manager.get("translation.group_distance", 50)
         )
 
-        # Cache de resultados recentes para evitar duplicatas
+        # Cache de resultados recentes para evitar duplicatas (instantes de
+        # time.monotonic(): só servem para medir idade)
         self.recent_results = {}
         self.last_emission_time = {}
+        # Fila de expiração (timestamp, chave) em ordem de idade; entradas
+        # de chaves re-registradas depois ficam obsoletas e são ignoradas
+        self._expiry_heap = []
+        # O callback roda nas threads de OCR do pipeline (uma por worker):
+        # limpeza, checagem e registro de duplicatas ficam sob esta trava
+        self._dedupe_lock = threading.Lock()
 
     def run(self):
         """Executa pipeline em thread separada com retry automático."""
@@ -86,8 +96,6 @@ class PipelineWorker(QThread):
                     if self.pipeline and self.running:
                         stats = self.pipeline.get_stats()
                         self.stats_updated.emit(stats)
-                        # Limpar cache antigo
-                        self._cleanup_old_cache()
 
                 # Se chegou aqui, saiu normalmente
                 break
@@ -144,19 +152,26 @@ class PipelineWorker(QThread):
             # Criar chave única para este resultado
             result_key = self._make_result_key(original, translated)
 
-            # Verificar se já processamos este resultado recentemente
-            if self._is_recent_duplicate(result_key):
+            with self._dedupe_lock:
+                # Limpar cache antigo
+                self._cleanup_old_cache()
+
+                # Verificar se já processamos este resultado recentemente
+                duplicate = self._is_recent_duplicate(result_key)
+                if not duplicate:
+                    # Registrar resultado
+                    now = time.monotonic()
+                    self.recent_results[result_key] = now
+                    self.last_emission_time[result_key] = now
+                    heapq.heappush(self._expiry_heap, (now, result_key))
+                    self.result_count += 1
+
+            if duplicate:
                 logger.debug(
                     f"⚠️ Resultado duplicado ignorado: '{translated[:30]}'"
                 )
                 return
 
-            # Registrar resultado
-            now = datetime.now()
-            self.recent_results[result_key] = now
-            self.last_emission_time[result_key] = now
-            self.result_count += 1
-
             logger.debug(f"🔍 Resultado #{self.result_count}: {result.keys()}")
 
             # Detecção de idioma se habilitado
@@ -190,9 +205,14 @@ class PipelineWorker(QThread):
                 "confidence": result.get("confidence", 1.0),
                 "language": language,
                 "provider": result.get("provider", "unknown"),
-                "timestamp": now.strftime("%H:%M:%S"),
+                "timestamp": time.strftime("%H:%M:%S"),
             }
 
+            # Ajuste do texto do balão feito aqui, fora da thread da GUI
+            from src.gui.translation_overlay import TextFitter
+
+            normalized["fitted"] = TextFitter.preshape(translated, bbox)
+
             logger.debug(
                 f"✅ Emitindo: orig='{original[:30]}', "
                 f"trans='{translated[:30]}', lang={language}"
@@ -202,51 +222,47 @@ class PipelineWorker(QThread):
         except Exception as e:
             logger.error(f"Erro ao processar resultado individual: {e}")
 
-    def _make_result_key(self, original: str, translated: str) -> str:
-        """Cria chave única para resultado baseado em original+traduzido normalizados."""
-        orig_normalized = original.lower().strip()
-        trans_normalized = translated.lower().strip()
-        return f"{orig_normalized}||{trans_normalized}"
+    def _make_result_key(self, original: str, translated: str) -> Tuple[str, str]:
+        """
+        Cria chave única para resultado baseado em original+traduzido
+        normalizados (tupla: sem montar uma string nova por chamada).
+        """
+        return original.lower().strip(), translated.lower().strip()
 
-    def _is_recent_duplicate(self, result_key: str) -> bool:
+    def _is_recent_duplicate(self, result_key: Tuple[str, str]) -> bool:
         """Verifica se resultado é duplicata recente (3s / 2s entre emissões)."""
         if result_key not in self.recent_results:
             return False
 
-        now = datetime.now()
-        age = now - self.recent_results[result_key]
+        now = time.monotonic()
 
         # Considerar duplicata se foi processado nos últimos 3 segundos
-        if age.total_seconds() < 3.0:
+        if now - self.recent_results[result_key] < 3.0:
             return True
 
         # Verificar cooldown de emissão (mínimo 2 segundos entre emissões)
         if result_key in self.last_emission_time:
-            last_age = now - self.last_emission_time[result_key]
-            if last_age.total_seconds() < 2.0:
+            if now - self.last_emission_time[result_key] < 2.0:
                 return True
 
         return False
 
     def _cleanup_old_cache(self):
-        """Remove entradas antigas do cache interno de duplicatas."""
-        now = datetime.now()
-        expired_keys = []
-
-        for key, ts in self.recent_results.items():
-            age = now - ts
-            if age.total_seconds() > 10.0:  # manter por 10s
-                expired_keys.append(key)
-
-        for key in expired_keys:
-            del self.recent_results[key]
-            if key in self.last_emission_time:
-                del self.last_emission_time[key]
-
-        if expired_keys:
-            logger.debug(
-                f"🗑️ Cache worker limpo: {len(expired_keys)} entradas"
-            )
+        """Remove entradas antigas do cache interno de duplicatas (com _dedupe_lock)."""
+        now = time.monotonic()
+        heap = self._expiry_heap
+        expired = 0
+
+        # Só olha o início da fila: nada vencido custa O(1)
+        while heap and now - heap[0][0] > 10.0:  # manter por 10s
+            ts, key = heapq.heappop(heap)
+            if self.recent_results.get(key) == ts:
+                del self.recent_results[key]
+                self.last_emission_time.pop(key, None)
+                expired += 1
+
+        if expired:
+            logger.debug(f"🗑️ Cache worker limpo: {expired} entradas")
 
     def stop(self):
         """Para pipeline e encerra a thread com segurança."""
@@ -11,16 +11,21 @@ Arquitetura: Strategy Pattern com fallback automático.
 Inclui pós-processamento de glossário para consistência de termos em PT-BR.
 """
 
-from typing import Optional
+from typing import List, Optional
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import re
+import threading
 import time  # Fase 7 – medir tempo de tradução
 
 from loguru import logger
 
 from src.utils.types import TranslationResult, TranslationProvider
 
+# Máximo de traduções simultâneas em translate_batch
+BATCH_WORKERS = 4
+
 
 # ============================================================================
 # CLASSE BASE
@@ -611,6 +616,11 @@ class TranslationService:
         # Pós-processador de glossário (aplicado a qualquer provedor)
         self.glossary = GlossaryPostProcessor()
 
+        # Threads para traduzir lotes em paralelo (criadas sob demanda; o
+        # lock evita que dois consumers criem cada um o seu pool)
+        self._batch_executor: Optional[ThreadPoolExecutor] = None
+        self._batch_lock = threading.Lock()
+
         # Log dos tradutores ativos
         logger.info(
             f"TranslationService: {len(self.translators)} tradutor(es) ativo(s)"
@@ -696,6 +706,49 @@ class TranslationService:
             from_cache=False,
         )
 
+    def translate_batch(
+        self,
+        texts: List[str],
+        source_langs: List[str],
+        target_lang: str = "pt",
+    ) -> List[TranslationResult]:
+        """
+        Traduz vários textos de uma vez, com as requisições em paralelo.
+
+        Cada texto passa por translate() (mesmo fallback e glossário);
+        o ganho é sobrepor as esperas de rede dos provedores.
+
+        Returns:
+            Resultados na mesma ordem de texts
+        """
+        if len(texts) <= 1:
+            return [
+                self.translate(text, source_lang, target_lang)
+                for text, source_lang in zip(texts, source_langs)
+            ]
+
+        with self._batch_lock:
+            if self._batch_executor is None:
+                self._batch_executor = ThreadPoolExecutor(
+                    max_workers=BATCH_WORKERS, thread_name_prefix="translate"
+                )
+            executor = self._batch_executor
+        return list(
+            executor.map(
+                self.translate,
+                texts,
+                source_langs,
+                [target_lang] * len(texts),
+            )
+        )
+
+    def close(self):
+        """Encerra as threads de lote (recriadas se translate_batch voltar a ser usado)."""
+        with self._batch_lock:
+            executor, self._batch_executor = self._batch_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
     def get_active_providers(self) -> list:
         """Retorna lista de provedores ativos."""
         return [name for name, _ in self.translators]
@@ -0,0 +1,113 @@
+"""Histórico de traduções espelhado em um CSV append-only da sessão."""
+import atexit
+import csv
+from pathlib import Path
+from typing import Optional, Tuple
+
+from loguru import logger
+
+
+class HistoryLog(list):
+    """
+    Lista de histórico que grava cada item novo em um CSV da sessão.
+
+    A lista em memória é limitada por quem a usa (pop dos mais antigos) e é
+    o que o diálogo mostra; o CSV da sessão recebe todos os itens, só por
+    append, e é a fonte da exportação (uma cópia do arquivo, sem reescrever
+    linha a linha). O arquivo é recriado a cada sessão.
+    """
+
+    # Chave do histórico -> cabeçalho da coluna no CSV
+    COLUMNS = {
+        'timestamp': 'Hora',
+        'original': 'Original',
+        'translated': 'Tradução',
+        'language': 'Idioma',
+        'provider': 'Provedor',
+    }
+
+    def __init__(self, directory: Optional[Path] = None):
+        """
+        Args:
+            directory: Pasta do CSV da sessão (padrão: "history" ao lado
+                do arquivo de log configurado em logging.file)
+        """
+        super().__init__()
+        if directory is None:
+            from src.config.settings import get_settings
+            directory = get_settings().get_history_dir()
+        self.path = Path(directory) / "history.csv"
+        self._file = None
+        self._writer: Optional[csv.DictWriter] = None
+        self._disabled = False  # espelho desligado após falha de gravação
+        atexit.register(self.close)
+
+    def _open(self):
+        """Cria o arquivo da sessão (no primeiro item) com cabeçalho."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Buffer de 64 KiB: append só copia a linha para a memória; o disco
+        # é escrito quando o buffer enche ou em snapshot()/close()
+        self._file = open(self.path, 'w', newline='', encoding='utf-8', buffering=1 << 16)
+        self._writer = csv.DictWriter(
+            self._file, fieldnames=list(self.COLUMNS), restval='', extrasaction='ignore'
+        )
+        self._writer.writerow(self.COLUMNS)
+        logger.debug(f"Histórico da sessão em {self.path}")
+
+    def append(self, item: dict):
+        """Adiciona item ao histórico e ao CSV da sessão."""
+        super().append(item)
+        if self._disabled:
+            return
+        try:
+            if self._writer is None:
+                self._open()
+            self._writer.writerow(item)
+        except OSError as e:
+            self._disable(e)
+
+    def _disable(self, error: OSError):
+        """Desliga o espelho: o histórico segue só em memória."""
+        # Não tenta de novo a cada item
+        self._disabled = True
+        self.close()
+        logger.error(f"Erro ao gravar histórico (CSV da sessão desativado): {error}")
+
+    def snapshot(self) -> Optional[Tuple[Path, int]]:
+        """
+        Descarrega o buffer e retorna (arquivo, tamanho em bytes) do CSV da
+        sessão, para exportar por cópia.
+
+        Chamado na thread que faz append; o tamanho marca o fim da última
+        linha completa (appends seguintes não entram na cópia).
+
+        Returns:
+            None se o CSV da sessão não existe ou foi desativado
+        """
+        if self._file is None:
+            return None
+        try:
+            self._file.flush()
+            return self.path, self._file.tell()
+        except OSError as e:
+            self._disable(e)
+            return None
+
+    def clear(self):
+        """Limpa o histórico e recomeça o CSV da sessão."""
+        super().clear()
+        self.close()
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.error(f"Erro ao limpar histórico: {e}")
+
+    def close(self):
+        """Fecha o arquivo da sessão (descarrega o buffer)."""
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError as e:
+                logger.error(f"Erro ao fechar histórico: {e}")
+            self._file = None
+            self._writer = None
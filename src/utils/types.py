@@ -97,8 +97,4 @@ class ProcessingTask:
     """Tarefa de processamento."""
     frame: Any
     area: ScreenArea
-    timestamp: datetime
-    priority: int = 5
-
-    def __lt__(self, other: "ProcessingTask") -> bool:
-        return self.priority < other.priority
+    timestamp: int  # time.monotonic_ns() da captura (só ordem/idade)